@@ -0,0 +1,52 @@
+"""
+Decision time and transposition-table hit rate of the "Moeilijk" enemy AI,
+plus how much harder it is to beat than the normal AI.
+
+    python -m benchmarks.battle_ai
+"""
+import random
+import statistics
+import time
+
+from utils.battle_ai import TranspositionTable, choose_enemy_move_hard
+from utils.battle_engine import MOVES, play_battle
+from utils.pokemon_data import POKEMON_IDS, get_stats
+
+
+def main(battles: int = 300, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    table = TranspositionTable()
+    timings = []
+
+    def hard(player, enemy):
+        def choose(player_hp, enemy_hp, defending):
+            t0 = time.perf_counter()
+            move = choose_enemy_move_hard(player, enemy, player_hp, enemy_hp, defending, table=table)
+            timings.append(time.perf_counter() - t0)
+            return move
+        return choose
+
+    def random_player(player_hp, enemy_hp):
+        return rng.choice(MOVES)
+
+    # A handful of matchups played repeatedly, like a server full of sessions
+    matchups = [tuple(rng.sample(POKEMON_IDS, 2)) for _ in range(20)]
+    wins = {"normaal": 0, "moeilijk": 0}
+    for i in range(battles):
+        pid, eid = matchups[i % len(matchups)]
+        player, enemy = get_stats(pid), get_stats(eid)
+        wins["normaal"] += play_battle(player, enemy, random_player, rng)
+        wins["moeilijk"] += play_battle(player, enemy, random_player, rng, choose_enemy=hard(player, enemy))
+
+    ms = sorted(t * 1e3 for t in timings)
+    print(f"{len(ms)} decisions over {battles} battles on {len(matchups)} matchups")
+    print(f"decision time: median {statistics.median(ms):.3f} ms, "
+          f"p95 {ms[int(len(ms) * 0.95)]:.3f} ms, max {ms[-1]:.3f} ms")
+    stats = table.stats()
+    print(f"transposition table: {stats['entries']} entries, hit rate {stats['hit_rate']:.1%}")
+    for ai, n in wins.items():
+        print(f"random player beats the {ai} AI in {n / battles:.1%} of battles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Load test: N headless sessions per page, played through ``AppTest`` on a
+process pool, all catching into one shared caught store (a throwaway data
+directory, one profile). Each session plays scripted games:
+
+  • pokemon   guesses, right about three times out of four, then the next one
+  • gevecht   attacks until the battle is over, then a new battle
+  • parcours  walks the best route to the finish, then a new maze
+  • memory    flips pairs (one miss in three), then a new board
+
+Every catch a session sees on screen is counted; at the end those counts are
+compared with the store, so catches a backend dropped under concurrent writers
+show up as lost updates. An interaction is one click and the script runs it
+triggers; its latency is the wall time of ``AppTest.run``. Sprites come from a
+copy of the sprite store and the fake sprite server (``utils.sprite_server``).
+
+    python -m benchmarks.load [--sessions 4] [--actions 40] [--workers 4] [--store sqlite]
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE = "loadtest"
+PAGES = {"pokemon": "10_*.py", "gevecht": "pages/20_*.py", "parcours": "pages/30_*.py", "memory": "pages/40_*.py"}
+MOVE_KEYS = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+
+
+def _init_worker(kind: str, data_dir: str, write_behind: int, sprite_dir: str, sprite_source: str) -> None:
+    import warnings
+
+    from utils import caught_pokemon
+    from utils.caught_store import open_store
+    from utils.leaderboard import Leaderboard, set_leaderboard
+    from utils.maze_pool import POOL
+    from utils.sprite_server import use_sprites
+
+    warnings.filterwarnings("ignore")
+    use_sprites(sprite_dir, sprite_source)
+    set_leaderboard(Leaderboard(data_dir))
+    POOL.workers = 0  # no process pool inside a pool worker (its children would block this one's exit)
+    caught_pokemon.set_store(open_store(kind, data_dir))
+    if write_behind:
+        caught_pokemon.enable_write_behind(write_behind)
+
+
+def _button(at, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def _click_cell(at, row: int, col: int):
+    """Select one cell of the Memory board. AppTest has no dataframe selection
+    API, so the selection is added to the widget states sent with the run."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    board = at.get("dataframe")[0]
+    states = at._tree.get_widget_states
+    selection = json.dumps({"selection": {"rows": [], "columns": [], "cells": [[row, str(col + 1)]]}})
+
+    def with_selection():
+        ws = states()
+        ws.widgets.append(WidgetState(id=board.proto.id, string_value=selection))
+        return ws
+
+    at._tree.get_widget_states = with_selection
+    return at
+
+
+# ── scripted games ─────────────────────────────────────────────────────────────
+# Each returns the next interaction (a clicked widget, or the AppTest) and a
+# check, called after the run, giving the Pokémon it caught (or None/False).
+
+def play_pokemon(at, rng):
+    from utils.pokemon_data import POKEMON
+
+    s = at.session_state
+    if s["revealed"]:
+        return _button(at, "➡️ Volgende Pokémon").click(), None
+    pid = s["pokemon_id"]
+    wrong = [b for b in at.button if b.key and b.key.startswith("choice_") and b.label != POKEMON[pid]]
+    if rng.random() < 0.25 and wrong:
+        return rng.choice(wrong).click(), None
+    return at.button(key=f"choice_{POKEMON[pid]}").click(), lambda: s["feedback"] == "correct" and pid
+
+
+def play_gevecht(at, rng):
+    s = at.session_state
+    if s["b_over"]:
+        return _button(at, "🔄 Nieuw gevecht").click(), None
+    eid = s["b_enemy_id"]
+    label = rng.choice(["👊 Aanval", "👊 Aanval", "✨ Speciaal", "🛡️ Verdedigen"])
+    return _button(at, label).click(), lambda: s["b_over"] and s["b_enemy_hp"] <= 0 and eid
+
+
+def play_parcours(at, rng):
+    from utils.maze import next_step
+
+    s = at.session_state
+    if s["mz_over"]:
+        return _button(at, "🔄 Nieuw doolhof").click(), None
+    move = next_step(s["mz_dist"], s["mz_plan"], s["mz_rows"], s["mz_cols"], s["mz_pos"])
+    pid = s["mz_pokemon_id"]
+    return at.button(key=MOVE_KEYS[move]).click(), lambda: s["mz_won"] and pid
+
+
+def play_memory(at, rng):
+    s = at.session_state
+    if s["m_over"]:
+        return _button(at, "🔄 Nieuw spel").click(), None
+    game, selected = s["m_game"], s["m_selected"]
+    cards = game.cards
+    if selected:
+        first = selected[0]
+        partners = [i for i in game.face_down() if i != first and cards[i] == cards[first]]
+        others = [i for i in game.face_down() if i != first and cards[i] != cards[first]]
+        idx = rng.choice(others) if others and rng.random() < 1 / 3 else partners[0]
+        pid = cards[first]
+        expect = lambda: cards[idx] == pid and pid
+    else:
+        idx, expect = rng.choice(game.face_down()), None
+    return _click_cell(at, *divmod(idx, s["m_cols"])), expect
+
+
+GAMES = {"pokemon": play_pokemon, "gevecht": play_gevecht, "parcours": play_parcours, "memory": play_memory}
+
+
+def run_session(page: str, actions: int, seed: int) -> dict:
+    """Worker: one session of ``page`` playing ``actions`` interactions."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    path = glob.glob(os.path.join(ROOT, PAGES[page]))[0]
+    at = AppTest.from_file(path, default_timeout=120)
+    at.session_state["profile"] = PROFILE
+    t0 = time.perf_counter()
+    at.run()
+    latencies = [time.perf_counter() - t0]
+    caught, errors = Counter(), 0
+    for _ in range(actions):
+        step, expect = GAMES[page](at, rng)
+        t0 = time.perf_counter()
+        at = step.run()
+        latencies.append(time.perf_counter() - t0)
+        if at.exception:
+            errors += 1
+            at = AppTest.from_file(path, default_timeout=120)
+            at.session_state["profile"] = PROFILE
+            at.run()
+            continue
+        pid = expect() if expect else None
+        if pid:
+            caught[pid] += 1
+
+    from utils import caught_pokemon
+
+    caught_pokemon.flush()
+    return {"page": page, "latencies": latencies, "caught": caught, "errors": errors}
+
+
+def _pct(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=4, help="sessions per page")
+    parser.add_argument("--actions", type=int, default=40, help="interactions per session")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--store", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--write-behind", type=int, default=0, help="catch buffer size (0 = write through)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from benchmarks import load  # workers unpickle by module name, and AppTest replaces __main__
+    from utils.caught_store import open_store
+    from utils.sprite_server import isolate_sprites
+
+    seeds = random.Random(args.seed)
+    jobs = [(page, args.actions, seeds.getrandbits(32)) for _ in range(args.sessions) for page in args.pages]
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        sprite_dir, sprite_source = isolate_sprites(data_dir)
+        print(f"{len(jobs)} sessions × {args.actions} interactions on {args.workers} worker(s), "
+              f"{args.store} store{f', write-behind {args.write_behind}' if args.write_behind else ''}\n")
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=load._init_worker,
+                                 initargs=(args.store, data_dir, args.write_behind, sprite_dir, sprite_source)) as pool:
+            for f in as_completed([pool.submit(load.run_session, *job) for job in jobs]):
+                results.append(f.result())
+        elapsed = time.perf_counter() - t0
+        stored = open_store(args.store, data_dir).load(PROFILE)
+
+    print(f"{'page':<10}{'runs':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}{'catches':>9}")
+    every = []
+    for page in args.pages:
+        mine = [r for r in results if r["page"] == page]
+        lat = [x * 1e3 for r in mine for x in r["latencies"]]
+        every += lat
+        print(f"{page:<10}{len(lat):>7}{_pct(lat, 50):>9.1f}{_pct(lat, 90):>9.1f}{_pct(lat, 99):>9.1f}"
+              f"{max(lat):>9.1f}{sum(r['errors'] for r in mine):>8}{sum(sum(r['caught'].values()) for r in mine):>9}")
+    print(f"{'all':<10}{len(every):>7}{_pct(every, 50):>9.1f}{_pct(every, 90):>9.1f}{_pct(every, 99):>9.1f}"
+          f"{max(every):>9.1f}")
+
+    expected = sum((r["caught"] for r in results), Counter())
+    lost = sum(max(0, n - stored.get(pid, 0)) for pid, n in expected.items())
+    extra = sum(max(0, n - expected.get(pid, 0)) for pid, n in stored.items())
+    print(f"\n{len(every) / elapsed:.1f} reruns/s over {elapsed:.1f}s")
+    print(f"catches: {sum(expected.values())} seen, {sum(stored.values())} stored, "
+          f"{lost} lost, {extra} unexpected")
+    return 1 if lost else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
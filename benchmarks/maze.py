@@ -0,0 +1,57 @@
+"""
+Maze generation time per algorithm and size, against the Parcours page's
+original recursive backtracker (which hits the recursion limit well before 101×101).
+
+    python -m benchmarks.maze
+"""
+import random
+import sys
+import timeit
+
+from utils.maze import ALGORITHMS
+
+SIZES = [9, 51, 101, 301, 1001]
+
+
+def recursive_backtracker(rows: int, cols: int) -> list[list[str]]:
+    """The generator the Parcours page used before ``utils.maze`` existed."""
+    grid = [["wall"] * cols for _ in range(rows)]
+
+    def carve(r: int, c: int):
+        grid[r][c] = "free"
+        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
+        random.shuffle(directions)
+        for dr, dc in directions:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == "wall":
+                grid[r + dr // 2][c + dc // 2] = "free"
+                carve(nr, nc)
+
+    carve(0, 0)
+    return grid
+
+
+def _ms(fn, size: int) -> float:
+    repeat = 5 if size <= 101 else 1
+    number = 20 if size <= 51 else 1
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e3
+
+
+def main() -> None:
+    names = ["recursive"] + list(ALGORITHMS)
+    print(f"recursion limit: {sys.getrecursionlimit()}\n")
+    print(f"{'size':<12}" + "".join(f"{n + ' ms':>16}" for n in names))
+    for n in SIZES:
+        row = []
+        try:
+            row.append(f"{_ms(lambda: recursive_backtracker(n, n), n):>16.2f}")
+        except RecursionError:
+            row.append(f"{'RecursionError':>16}")
+        for gen in ALGORITHMS.values():
+            rng = random.Random(n)
+            row.append(f"{_ms(lambda: gen(n, n, rng), n):>16.2f}")
+        print(f"{f'{n}×{n}':<12}" + "".join(row))
+
+
+if __name__ == "__main__":
+    main()
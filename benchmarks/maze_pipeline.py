@@ -0,0 +1,68 @@
+"""
+Acceptance rate and throughput of the validated maze pipeline, per size and
+difficulty, with candidates built across a process pool. The "fixed rate"
+column is the share of mazes the page's original placement (the same hazard
+chance on every square) would have put in the band.
+
+    python -m benchmarks.maze_pipeline [--workers 4] [--seconds 2]
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.maze import CELL_FREE, CELL_HAZARD, DIFFICULTIES, generate, life_cost
+from utils.maze_pool import batch_size, candidate_batch
+
+SIZES = [9, 21, 51, 101]
+ALGORITHM = "kruskal"
+
+
+def fixed_rate_in_band(rows: int, cols: int, difficulty: str, n: int, seed: int) -> float:
+    """Share of ``n`` mazes with hazards at a fixed rate that land in the band."""
+    rng = random.Random(seed)
+    level = DIFFICULTIES[difficulty]
+    lo, hi = level["band"]
+    ok = 0
+    for _ in range(n):
+        grid = generate(rows, cols, ALGORITHM, rng)
+        for i in range(1, rows * cols - 1):
+            if grid[i] == CELL_FREE and rng.random() < level["hazard"]:
+                grid[i] = CELL_HAZARD
+        ok += lo <= life_cost(grid, rows, cols) <= hi
+    return ok / n
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per size and difficulty")
+    args = parser.parse_args(argv)
+
+    print(f"{args.workers} worker(s), algorithm={ALGORITHM}\n")
+    print(f"{'size':<10}{'difficulty':<12}{'band':>6}{'accepted':>10}{'fixed rate':>12}"
+          f"{'cand/s':>10}{'mazes/s':>10}")
+    seeds = random.Random(0)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for n in SIZES:
+            for difficulty in DIFFICULTIES:
+                key = (n, n, ALGORITHM, difficulty)
+                candidates = accepted = 0
+                t0 = time.perf_counter()
+                while time.perf_counter() - t0 < args.seconds:
+                    futures = [pool.submit(candidate_batch, key, batch_size(key), seeds.getrandbits(64))
+                               for _ in range(args.workers)]
+                    for f in futures:
+                        ok, tried = f.result()
+                        candidates += tried
+                        accepted += len(ok)
+                elapsed = time.perf_counter() - t0
+                lo, hi = DIFFICULTIES[difficulty]["band"]
+                fixed = fixed_rate_in_band(n, n, difficulty, min(candidates, 200), seeds.getrandbits(64))
+                print(f"{f'{n}×{n}':<10}{difficulty:<12}{f'{lo}–{hi}':>6}{accepted / candidates:>10.0%}"
+                      f"{fixed:>12.0%}{candidates / elapsed:>10.1f}{accepted / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
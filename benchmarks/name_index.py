@@ -0,0 +1,37 @@
+"""
+Lookup latency of the name index against the Pokédex's original linear scan.
+
+    python -m benchmarks.name_index
+"""
+import timeit
+
+from utils.name_index import NameIndex, get_name_index
+from utils.pokemon_data import POKEMON
+
+QUERIES = ["p", "pi", "chu", "mime", "mr. mime", "dragon", "zzz", "pikachuu"]
+
+
+def linear_scan(search: str) -> list[int]:
+    """The search the Pokédex page did before the index existed."""
+    return [pid for pid, name in POKEMON.items() if search.lower() in name.lower()]
+
+
+def _per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 2000) -> None:
+    index = get_name_index()
+    build_ms = min(timeit.repeat(lambda: NameIndex(POKEMON), number=1, repeat=5)) * 1e3
+    print(f"index build: {build_ms:.2f} ms for {len(POKEMON)} names\n")
+    print(f"{'query':<12}{'scan µs':>10}{'index µs':>10}{'fuzzy µs':>10}{'best_match µs':>15}")
+    for q in QUERIES:
+        scan = _per_call_us(lambda: linear_scan(q), number)
+        exact = _per_call_us(lambda: index.search(q, fuzzy=False), number)
+        fuzzy = _per_call_us(lambda: index.search(q), number)
+        best = _per_call_us(lambda: index.best_match(q), number)
+        print(f"{q!r:<12}{scan:>10.2f}{exact:>10.2f}{fuzzy:>10.2f}{best:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Timings of every hot path, from the helpers up to full page reruns, with
+pytest-benchmark.
+
+    pytest benchmarks/                                   # time everything, report only
+    pytest benchmarks/ -k maze                           # one group
+    pytest benchmarks/ --benchmark-autosave              # store this run
+    pytest benchmarks/ --benchmark-compare               # compare with the last stored run
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=min:25%
+
+Stored runs go to ``.benchmarks/<machine>/`` and are not committed: absolute
+timings only compare on the machine that made them. Checking against a stored
+run is opt-in (``--benchmark-compare-fail``); a plain run never fails on speed.
+
+Caught-Pokémon cases and page reruns run against a throwaway store with every
+Pokémon caught (and an empty leaderboard), so the real ``data/`` is never touched;
+sprites come from a copy of the sprite store and the fake sprite server.
+"""
+import glob
+import os
+import random
+import warnings
+
+import pytest
+
+from utils import caught_pokemon
+from utils.battle_engine import calc_damage
+from utils.caught_store import DEFAULT_PROFILE, JsonStore, SqliteStore
+from utils.dex import caught_card, display_list
+from utils.leaderboard import Leaderboard, set_leaderboard
+from utils.maze import ALGORITHMS, CELL_WALL, build_valid_maze, generate
+from utils.maze_view import MazeView
+from utils.pokemon_data import POKEMON_IDS, get_stats
+from utils.sprite_server import isolate_sprites
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = sorted(glob.glob(os.path.join(ROOT, "10_*.py"))) + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+MAZE_SIZES = [21, 101]
+
+
+def _fill(store, ids: list[int]) -> None:
+    store.reset(DEFAULT_PROFILE)
+    store.add(DEFAULT_PROFILE, ids)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sandbox(tmp_path_factory):
+    """A temporary directory with its own sprite store; the caught store is put back afterwards."""
+    warnings.filterwarnings("ignore")
+    tmp = str(tmp_path_factory.mktemp("bench"))
+    isolate_sprites(tmp)
+    old_store = caught_pokemon._get_store()
+    yield tmp
+    caught_pokemon.set_store(old_store)
+
+
+# ── core ───────────────────────────────────────────────────────────────────────
+
+def test_get_stats(benchmark):
+    rng = random.Random(0)
+    benchmark(lambda: get_stats(rng.choice(POKEMON_IDS)))
+
+
+@pytest.mark.parametrize("move", ["aanval", "speciaal"])
+def test_calc_damage(benchmark, move):
+    rng = random.Random(0)
+    benchmark(calc_damage, get_stats(25), get_stats(6), move, rng)
+
+
+# ── maze ───────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n", MAZE_SIZES)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_maze_generate(benchmark, algorithm, n):
+    rng = random.Random(0)
+    benchmark(generate, n, n, algorithm, rng)
+
+
+@pytest.mark.parametrize("n", MAZE_SIZES)
+def test_maze_new_maze(benchmark, n):
+    rng = random.Random(0)
+    benchmark(build_valid_maze, n, n, "backtracker", "normaal", rng)
+
+
+def _td(grid, cols: int):
+    """A cell renderer shaped like the Parcours page's ``cell_html``."""
+    def render(r: int, c: int) -> str:
+        wall = grid[r * cols + c] == CELL_WALL
+        return (f'<td style="width:42px;height:42px;text-align:center;vertical-align:middle;'
+                f'background:{"#333" if wall else "#fafafa"};border:1px solid #ddd;font-size:1.4rem;">'
+                f'{"⬛" if wall else ""}</td>')
+    return render
+
+
+@pytest.fixture(scope="module")
+def big_maze():
+    n = 201
+    grid = generate(n, n, "backtracker", random.Random(0))
+    return n, grid, _td(grid, n)
+
+
+def test_maze_view_cold(benchmark, big_maze):
+    n, _, render = big_maze
+    benchmark(lambda: MazeView(n, n).html(render))
+
+
+def test_maze_view_move(benchmark, big_maze):
+    n, grid, render = big_maze
+    free = [(i // n, i % n) for i in range(n * n) if grid[i] != CELL_WALL]
+    view = MazeView(n, n)
+    view.html(render)
+    walk = iter(free * 1000)
+
+    def move():
+        pos = next(walk)
+        view.invalidate(pos)
+        view.follow(pos)
+        return view.html(render)
+    benchmark(move)
+
+
+# ── caught Pokémon ─────────────────────────────────────────────────────────────
+
+@pytest.fixture(params=["sqlite", "json"])
+def full_store(request, sandbox):
+    """A store of the given kind with every Pokémon caught, in use by ``caught_pokemon``."""
+    path = os.path.join(sandbox, f"caught-{request.param}")
+    store = SqliteStore(path) if request.param == "sqlite" else JsonStore(path)
+    _fill(store, POKEMON_IDS)
+    caught_pokemon.set_store(store)
+    return store
+
+
+def test_caught_mark(benchmark, full_store):
+    benchmark(caught_pokemon.mark_caught, 25)
+
+
+def test_caught_mark_load(benchmark, full_store):
+    def mark_load():
+        caught_pokemon.mark_caught(25)
+        return caught_pokemon.load_caught()
+    benchmark(mark_load)
+
+
+def test_caught_load_hit(benchmark, full_store):
+    caught_pokemon.load_caught()
+    benchmark(caught_pokemon.load_caught)
+
+
+# ── Pokédex ────────────────────────────────────────────────────────────────────
+
+CAUGHT = {pid: 1 + pid % 7 for pid in POKEMON_IDS}
+
+
+def test_dex_display(benchmark):
+    benchmark(display_list, CAUGHT)
+
+
+def test_dex_display_search(benchmark):
+    benchmark(display_list, CAUGHT, "pi", "Naam")
+
+
+def test_dex_cards(benchmark):
+    benchmark(lambda: [caught_card(*row) for row in display_list(CAUGHT)[:48]])
+
+
+# ── full page reruns ───────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="module")
+def page_data(sandbox):
+    path = os.path.join(sandbox, "pages")
+    store = SqliteStore(path)
+    _fill(store, POKEMON_IDS)
+    caught_pokemon.set_store(store)
+    set_leaderboard(Leaderboard(path))
+
+
+def _app(path: str):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(path, default_timeout=60).run()
+    assert not at.exception, at.exception[0].value
+    return at
+
+
+@pytest.mark.parametrize("path", PAGES, ids=lambda p: os.path.basename(p).split("_", 1)[0])
+def test_page_rerun(benchmark, page_data, path):
+    benchmark(_app(path).run)
+
+
+def test_page_parcours_move(benchmark, page_data):
+    """A real move every rerun, back and forth between two free squares."""
+    at = _app(os.path.join(ROOT, "pages", "30_🏃_Parcours.py"))
+    keys = iter(["right", "left"] * 100_000)
+    if at.session_state["mz_grid"][1] == CELL_WALL:
+        keys = iter(["down", "up"] * 100_000)
+    benchmark(lambda: at.button(next(keys)).click().run())
@@ -1,24 +1,22 @@
 import streamlit as st
 import random
 from utils.styles import inject_custom_css
+from utils.metrics import instrument
+from utils.profile import player_profile
 from utils.pokemon_data import POKEMON, POKEMON_IDS, get_stats, sprite_url, back_sprite_url
 from utils.caught_pokemon import mark_caught
+from utils.battle_engine import calc_damage, choose_enemy_move, shielded
+from utils.battle_ai import choose_enemy_move_hard
+from utils.battle_odds import odds_table, odds_table_nowait
+from utils.leaderboard import get_leaderboard, new_entry
 
 st.set_page_config(page_title="Pokémon Gevecht", page_icon="⚔️", layout="wide")
+instrument("gevecht")
 inject_custom_css()
+profile = player_profile()
 
 # ── helpers ────────────────────────────────────────────────────────────────────
 
-def calc_damage(attacker: dict, defender: dict, move: str) -> int:
-    if move == "aanval":
-        base = max(1, attacker["attack"] - defender["defense"] // 2)
-        return random.randint(max(1, base - 5), base + 10)
-    elif move == "speciaal":
-        base = max(5, attacker["attack"] * 3 // 2 - defender["defense"] // 3)
-        return random.randint(max(1, base - 5), base + 15)
-    return 0  # verdediging doet geen schade
-
-
 def new_battle(player_id: int | None = None, enemy_id: int | None = None):
     pid = player_id or random.choice(POKEMON_IDS)
     eid = enemy_id or random.choice([i for i in POKEMON_IDS if i != pid])
@@ -49,9 +47,29 @@ def hp_bar(current: int, maximum: int, color: str = "#4caf50") -> str:
     )
 
 
+def win_odds() -> tuple[float, bool]:
+    """Exact chance that the player wins from the current state (best play), and
+    whether it is against the "Moeilijk" AI: until that table has been built in
+    the background the odds are against the normal AI."""
+    ss = st.session_state
+    table = None
+    if ss.get("b_ai") == "Moeilijk":
+        table = odds_table_nowait(ss.b_player_stats, ss.b_enemy_stats, enemy_ai="hard")
+    hard = table is not None
+    if table is None:
+        table = odds_table(ss.b_player_stats, ss.b_enemy_stats)
+    if ss.b_turn == "enemy":
+        return table.win_chance_enemy_turn(ss.b_player_hp, ss.b_enemy_hp, ss.b_defending), hard
+    return table.win_chance(ss.b_player_hp, ss.b_enemy_hp), hard
+
+
 # ── init ───────────────────────────────────────────────────────────────────────
 if "b_player_id" not in st.session_state:
     new_battle()
+if "b_wins" not in st.session_state:
+    st.session_state.b_wins      = 0            # battles won in a row, across battles
+    st.session_state.b_win_entry = new_entry()  # that run's leaderboard entry
+    st.session_state.b_place     = None
 
 # ── layout ────────────────────────────────────────────────────────────────────
 st.markdown("## ⚔️ Pokémon Gevecht")
@@ -65,13 +83,21 @@ enemy_name  = POKEMON[eid]
 col_p, col_vs, col_e = st.columns([2, 1, 2])
 with col_p:
     st.markdown(f"**Jouw Pokémon: {player_name}**")
-    st.image(back_sprite_url(pid), width=160)
+    st.image(back_sprite_url(pid, 160), width=160)
     st.markdown(hp_bar(st.session_state.b_player_hp, st.session_state.b_player_maxhp), unsafe_allow_html=True)
+    if not st.session_state.b_over:
+        odds, vs_hard = win_odds()
+        if vs_hard or st.session_state.get("b_ai") != "Moeilijk":
+            st.caption(f"🎲 Winkans: **{odds:.0%}**",
+                       help="Exact berekend, bij beste spel tegen de gekozen tegenstander.")
+        else:
+            st.caption(f"🎲 Winkans: **{odds:.0%}** tegen een normale tegenstander",
+                       help="De winkans tegen Moeilijk wordt nog berekend en verschijnt na de volgende zet.")
 with col_vs:
     st.markdown("<div style='text-align:center;font-size:2.5rem;margin-top:60px;'>⚔️</div>", unsafe_allow_html=True)
 with col_e:
     st.markdown(f"**Tegenstander: {enemy_name}**")
-    st.image(sprite_url(eid), width=160)
+    st.image(sprite_url(eid, 160), width=160)
     st.markdown(hp_bar(st.session_state.b_enemy_hp, st.session_state.b_enemy_maxhp), unsafe_allow_html=True)
 
 st.markdown("---")
@@ -103,25 +129,28 @@ if not st.session_state.b_over:
                 st.session_state.b_log.append(f"🏆 **{enemy_name} is verslagen! Jij wint!**")
                 st.session_state.b_over = True
                 st.session_state.b_turn = "done"
-                mark_caught(eid)
+                mark_caught(eid, profile)
+                st.session_state.b_wins += 1
+                st.session_state.b_place = get_leaderboard().record(
+                    "gevecht", None, profile, st.session_state.b_wins, entry=st.session_state.b_win_entry)
             else:
                 st.session_state.b_turn = "enemy"
             st.rerun()
 
     elif st.session_state.b_turn == "enemy":
-        # Enemy AI: random move, slightly smarter when low HP
-        enemy_hp_pct = st.session_state.b_enemy_hp / st.session_state.b_enemy_maxhp
-        if enemy_hp_pct < 0.3:
-            move = random.choice(["speciaal", "speciaal", "aanval"])
+        if st.session_state.get("b_ai") == "Moeilijk":
+            move = choose_enemy_move_hard(
+                st.session_state.b_player_stats, st.session_state.b_enemy_stats,
+                st.session_state.b_player_hp, st.session_state.b_enemy_hp, st.session_state.b_defending,
+            )
         else:
-            move = random.choice(["aanval", "aanval", "speciaal", "verdediging"])
+            move = choose_enemy_move(st.session_state.b_enemy_hp, st.session_state.b_enemy_maxhp)
 
-        defense_mult = 0.5 if st.session_state.b_defending else 1.0
         if move != "verdediging":
             raw_dmg = calc_damage(st.session_state.b_enemy_stats, st.session_state.b_player_stats, move)
-            dmg = max(1, int(raw_dmg * defense_mult))
+            dmg = shielded(raw_dmg, st.session_state.b_defending)
             st.session_state.b_player_hp = max(0, st.session_state.b_player_hp - dmg)
-            shield_txt = " (jouw schild hielp!)" if st.session_state.b_defending and defense_mult < 1 else ""
+            shield_txt = " (jouw schild hielp!)" if st.session_state.b_defending else ""
             st.session_state.b_log.append(f"{enemy_name} gebruikte **{move}** → jij verliest **{dmg} HP**{shield_txt}")
         else:
             st.session_state.b_log.append(f"{enemy_name} koos voor **verdediging**.")
@@ -132,6 +161,9 @@ if not st.session_state.b_over:
             st.session_state.b_log.append(f"💀 **Jouw {player_name} is verslagen! Je verliest.**")
             st.session_state.b_over = True
             st.session_state.b_turn = "done"
+            st.session_state.b_wins = 0
+            st.session_state.b_win_entry = new_entry()
+            st.session_state.b_place = None
         else:
             st.session_state.b_turn = "player"
         st.rerun()
@@ -141,6 +173,9 @@ else:
     if "wint" in last:
         st.success(last)
         st.info(f"🎉 **{enemy_name}** is toegevoegd aan je Pokédex!")
+        if st.session_state.b_place:
+            st.caption(f"🏅 {st.session_state.b_wins} overwinning(en) op rij: plek "
+                       f"{st.session_state.b_place} in het klassement.")
     else:
         st.error(last)
     if st.button("🔄 Nieuw gevecht", type="primary", use_container_width=True):
@@ -155,6 +190,8 @@ if st.session_state.b_log:
 
 # sidebar: pick your pokemon
 with st.sidebar:
+    st.radio("Tegenstander", ["Normaal", "Moeilijk"], key="b_ai", horizontal=True,
+             help="Moeilijk: de tegenstander rekent zijn zetten vooruit.")
     st.markdown("### Kies jouw Pokémon")
     chosen = st.selectbox("Pokémon", options=POKEMON_IDS, format_func=lambda i: POKEMON[i])
     if st.button("Start met deze Pokémon"):
@@ -10,26 +10,34 @@ Navigeer jouw Pokémon door een gegenereerd doolhof.
 import streamlit as st
 import random
 from utils.styles import inject_custom_css
+from utils.metrics import instrument
+from utils.profile import player_profile
 from utils.pokemon_data import POKEMON, POKEMON_IDS, sprite_url
 from utils.caught_pokemon import mark_caught
+from utils.maze import (CELL_BONUS, CELL_FINISH, CELL_FREE, CELL_HAZARD, CELL_START, CELL_WALL,
+                        DIFFICULTIES, MAX_LIVES, next_step, route)
+from utils.maze_pool import POOL
+from utils.maze_view import MazeView
+from utils.leaderboard import get_leaderboard
 
 st.set_page_config(page_title="Pokémon Doolhof", page_icon="🗺️", layout="wide")
+instrument("parcours")
 inject_custom_css()
+profile = player_profile()
 
 # ── constants ──────────────────────────────────────────────────────────────────
-ROWS, COLS = 9, 9          # must be odd for maze generator
-MAX_LIVES  = 5
-HAZARD_PROB  = 0.08        # chance a free cell becomes a hazard
-BONUS_PROB   = 0.10        # chance a free cell becomes a bonus
-
-CELL_WALL    = "wall"
-CELL_FREE    = "free"
-CELL_HAZARD  = "hazard"
-CELL_BONUS   = "bonus"
-CELL_START   = "start"
-CELL_FINISH  = "finish"
-
-HAZARDS = ["🔥", "💧", "🪨", "⚡", "🌵"]
+SIZES = list(range(5, 52, 2)) + [75, 101, 151, 201]   # maze rows/cols must be odd
+DEFAULT_SIZE = 9
+
+ALGORITHM_LABELS = {
+    "backtracker": "Diepte-eerst (lange gangen)",
+    "kruskal":     "Kruskal (veel doodlopende paden)",
+    "wilson":      "Wilson (volledig willekeurig)",
+    "eller":       "Eller (rij voor rij)",
+}
+DEFAULT_ALGORITHM = "backtracker"
+DEFAULT_DIFFICULTY = "normaal"
+DIRECTIONS = {(-1, 0): "omhoog ⬆️", (1, 0): "omlaag ⬇️", (0, -1): "naar links ⬅️", (0, 1): "naar rechts ➡️"}
 
 CELL_EMOJI = {
     CELL_WALL:   "⬛",
@@ -40,47 +48,37 @@ CELL_EMOJI = {
     CELL_FINISH: "🏁",
 }
 
-# ── maze generation (randomised DFS) ──────────────────────────────────────────
-
-def _generate_maze(rows: int, cols: int) -> list[list[str]]:
-    """Return a grid of CELL_WALL / CELL_FREE using recursive backtracking."""
-    grid = [[CELL_WALL] * cols for _ in range(rows)]
+# ── maze generation ───────────────────────────────────────────────────────────
 
-    def carve(r: int, c: int):
-        grid[r][c] = CELL_FREE
-        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-        random.shuffle(directions)
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == CELL_WALL:
-                grid[r + dr // 2][c + dc // 2] = CELL_FREE
-                carve(nr, nc)
-
-    carve(0, 0)
-    return grid
+def maze_key() -> tuple:
+    """The pool key of the maze settings in the sidebar."""
+    return (
+        st.session_state.get("mz_rows_choice", DEFAULT_SIZE),
+        st.session_state.get("mz_cols_choice", DEFAULT_SIZE),
+        st.session_state.get("mz_algo_choice", DEFAULT_ALGORITHM),
+        st.session_state.get("mz_diff_choice", DEFAULT_DIFFICULTY),
+    )
 
 
 def new_maze(pokemon_id: int | None = None):
     pid = pokemon_id or random.choice(POKEMON_IDS)
-    grid = _generate_maze(ROWS, COLS)
-
-    # Place hazards and bonuses on free cells (avoid start & finish corners)
-    hazard_map: dict[tuple, str] = {}
-    for r in range(ROWS):
-        for c in range(COLS):
-            if grid[r][c] == CELL_FREE and (r, c) not in ((0, 0), (ROWS-1, COLS-1)):
-                roll = random.random()
-                if roll < HAZARD_PROB:
-                    grid[r][c] = CELL_HAZARD
-                    hazard_map[(r, c)] = random.choice(HAZARDS)
-                elif roll < HAZARD_PROB + BONUS_PROB:
-                    grid[r][c] = CELL_BONUS
-
-    grid[0][0]              = CELL_START
-    grid[ROWS-1][COLS-1]    = CELL_FINISH
-
-    st.session_state.mz_grid       = grid
-    st.session_state.mz_hazard_map = hazard_map
+    # Ready-made in the background; hints, par and the route overlay are lookups
+    # in its distance field. ``mz_plan`` keeps the squares as generated, since
+    # hazards and bonuses are consumed from ``mz_grid`` during play.
+    key = maze_key()
+    rows, cols = key[:2]
+    maze = POOL.take(key)
+
+    st.session_state.mz_key        = key
+    st.session_state.mz_grid       = maze["grid"]
+    st.session_state.mz_rows       = rows
+    st.session_state.mz_cols       = cols
+    st.session_state.mz_view       = MazeView(rows, cols)
+    st.session_state.mz_plan       = maze["plan"]
+    st.session_state.mz_dist       = maze["dist"]
+    st.session_state.mz_par        = maze["par"]
+    st.session_state.mz_route      = set()
+    st.session_state.mz_hazard_map = maze["hazards"]
     st.session_state.mz_pokemon_id = pid
     st.session_state.mz_pos        = (0, 0)
     st.session_state.mz_visited    = {(0, 0)}
@@ -89,24 +87,27 @@ def new_maze(pokemon_id: int | None = None):
     st.session_state.mz_over       = False
     st.session_state.mz_won        = False
     st.session_state.mz_message    = ""
+    st.session_state.mz_place      = None
 
 
 def try_move(dr: int, dc: int):
     r, c = st.session_state.mz_pos
     nr, nc = r + dr, c + dc
     grid = st.session_state.mz_grid
+    rows, cols = st.session_state.mz_rows, st.session_state.mz_cols
 
-    if not (0 <= nr < ROWS and 0 <= nc < COLS):
+    if not (0 <= nr < rows and 0 <= nc < cols):
         st.session_state.mz_message = "⛔ Buiten het doolhof!"
         return
-    if grid[nr][nc] == CELL_WALL:
+    if grid[nr * cols + nc] == CELL_WALL:
         st.session_state.mz_message = "🧱 Dat is een muur!"
         return
 
+    st.session_state.mz_view.invalidate((r, c), (nr, nc))
     st.session_state.mz_pos = (nr, nc)
     st.session_state.mz_visited.add((nr, nc))
     st.session_state.mz_steps += 1
-    cell = grid[nr][nc]
+    cell = grid[nr * cols + nc]
 
     if cell == CELL_HAZARD:
         emoji = st.session_state.mz_hazard_map.get((nr, nc), "⚠️")
@@ -117,23 +118,80 @@ def try_move(dr: int, dc: int):
             st.session_state.mz_won  = False
             return
         # Replace hazard with free so it can be crossed safely next time
-        grid[nr][nc] = CELL_FREE
+        grid[nr * cols + nc] = CELL_FREE
 
     elif cell == CELL_BONUS:
         st.session_state.mz_lives = min(MAX_LIVES + 1, st.session_state.mz_lives + 1)
         st.session_state.mz_message = "⭐ Bonus! Je krijgt een extra leven!"
-        grid[nr][nc] = CELL_FREE
+        grid[nr * cols + nc] = CELL_FREE
 
     elif cell == CELL_FINISH:
         st.session_state.mz_over = True
         st.session_state.mz_won  = True
-        mark_caught(st.session_state.mz_pokemon_id)
+        mark_caught(st.session_state.mz_pokemon_id, profile)
+        rows, cols, _, difficulty = st.session_state.mz_key
+        st.session_state.mz_place = get_leaderboard().record(
+            "parcours", f"{rows}×{cols} {difficulty}", profile, st.session_state.mz_steps)
         return
 
     else:
         st.session_state.mz_message = ""
 
 
+def hint() -> None:
+    """Point the player along the cheapest route (a lookup, no search)."""
+    s = st.session_state
+    move = next_step(s.mz_dist, s.mz_plan, s.mz_rows, s.mz_cols, s.mz_pos)
+    s.mz_message = f"💡 Tip: ga {DIRECTIONS[move]}" if move else "💡 Geen route meer naar de finish."
+
+
+def update_route(show: bool) -> None:
+    """Mark the best route from the player's square, redrawing only rows it changes."""
+    s = st.session_state
+    new = set(route(s.mz_dist, s.mz_plan, s.mz_rows, s.mz_cols, s.mz_pos)[1:-1]) if show else set()
+    s.mz_view.invalidate(*(new ^ s.mz_route))
+    s.mz_route = new
+
+
+def cell_html(r: int, c: int) -> str:
+    """One ``<td>`` of the board."""
+    if (r, c) == st.session_state.mz_pos:
+        pid = st.session_state.mz_pokemon_id
+        cell_content = f'<img src="{sprite_url(pid, 36)}" width="36" style="image-rendering:pixelated;"/>'
+        bg = "#c8e6c9"
+    else:
+        ctype = st.session_state.mz_grid[r * st.session_state.mz_cols + c]
+        if ctype == CELL_WALL:
+            cell_content = "⬛"
+            bg = "#333"
+        elif ctype == CELL_HAZARD:
+            cell_content = st.session_state.mz_hazard_map.get((r, c), "⚠️")
+            bg = "#fff3e0"
+        elif ctype == CELL_BONUS:
+            cell_content = "⭐"
+            bg = "#fffde7"
+        elif ctype == CELL_FINISH:
+            cell_content = "🏁"
+            bg = "#e8f5e9"
+        elif ctype == CELL_START:
+            cell_content = "🟩"
+            bg = "#f1f8e9"
+        elif (r, c) in st.session_state.mz_visited:
+            cell_content = "·"
+            bg = "#dceeff"
+        else:
+            cell_content = ""
+            bg = "#fafafa"
+        if (r, c) in st.session_state.mz_route:
+            cell_content = cell_content or "•"
+            bg = "#fff59d"
+    return (
+        f'<td style="width:42px;height:42px;text-align:center;vertical-align:middle;'
+        f'background:{bg};border:1px solid #ddd;font-size:1.4rem;">'
+        f'{cell_content}</td>'
+    )
+
+
 # ── init ───────────────────────────────────────────────────────────────────────
 if "mz_grid" not in st.session_state:
     new_maze()
@@ -148,11 +206,11 @@ name = POKEMON[pid]
 # Header row: sprite + stats
 col_sprite, col_stats = st.columns([1, 3])
 with col_sprite:
-    st.image(sprite_url(pid), width=100, caption=name)
+    st.image(sprite_url(pid, 100), width=100, caption=name)
 with col_stats:
     lives_str = "❤️ " * st.session_state.mz_lives + "🖤 " * max(0, max(MAX_LIVES, st.session_state.mz_lives) - st.session_state.mz_lives)
     st.markdown(f"**Levens:** {lives_str}")
-    st.markdown(f"**Stappen:** {st.session_state.mz_steps}")
+    st.markdown(f"**Stappen:** {st.session_state.mz_steps} &nbsp;·&nbsp; par {st.session_state.mz_par}")
     if st.session_state.mz_message:
         st.info(st.session_state.mz_message)
 
@@ -160,49 +218,13 @@ st.markdown("---")
 
 # ── render grid ────────────────────────────────────────────────────────────────
 if not st.session_state.mz_over:
-    pr, pc  = st.session_state.mz_pos
-    grid    = st.session_state.mz_grid
-    hmap    = st.session_state.mz_hazard_map
-    visited = st.session_state.mz_visited
-
-    rows_html = ""
-    for r in range(ROWS):
-        row_html = "<tr>"
-        for c in range(COLS):
-            if (r, c) == (pr, pc):
-                cell_content = f'<img src="{sprite_url(pid)}" width="36" style="image-rendering:pixelated;"/>'
-                bg = "#c8e6c9"
-            else:
-                ctype = grid[r][c]
-                if ctype == CELL_WALL:
-                    cell_content = "⬛"
-                    bg = "#333"
-                elif ctype == CELL_HAZARD:
-                    cell_content = hmap.get((r, c), "⚠️")
-                    bg = "#fff3e0"
-                elif ctype == CELL_BONUS:
-                    cell_content = "⭐"
-                    bg = "#fffde7"
-                elif ctype == CELL_FINISH:
-                    cell_content = "🏁"
-                    bg = "#e8f5e9"
-                elif ctype == CELL_START:
-                    cell_content = "🟩"
-                    bg = "#f1f8e9"
-                else:
-                    if (r, c) in visited:
-                        cell_content = "·"
-                        bg = "#dceeff"
-                    else:
-                        cell_content = ""
-                        bg = "#fafafa"
-            row_html += (
-                f'<td style="width:42px;height:42px;text-align:center;vertical-align:middle;'
-                f'background:{bg};border:1px solid #ddd;font-size:1.4rem;">'
-                f'{cell_content}</td>'
-            )
-        row_html += "</tr>"
-        rows_html += row_html
+    view = st.session_state.mz_view
+    update_route(st.session_state.get("mz_show_route", False))
+    view.follow(st.session_state.mz_pos)
+    rows_html = view.html(cell_html)
+    if view.clipped:
+        pr, pc = st.session_state.mz_pos
+        st.caption(f"📍 Rij {pr + 1}/{st.session_state.mz_rows} · kolom {pc + 1}/{st.session_state.mz_cols}")
 
     st.markdown(
         f'<table style="border-collapse:collapse;margin:auto;">{rows_html}</table>',
@@ -217,10 +239,13 @@ if not st.session_state.mz_over:
         if st.button("⬆️", use_container_width=True, key="up"):
             try_move(-1, 0); st.rerun()
 
-    left_col, _, right_col = st.columns([1, 1, 1])
+    left_col, hint_col, right_col = st.columns([1, 1, 1])
     with left_col:
         if st.button("⬅️", use_container_width=True, key="left"):
             try_move(0, -1); st.rerun()
+    with hint_col:
+        if st.button("💡 Hint", use_container_width=True, key="hint"):
+            hint(); st.rerun()
     with right_col:
         if st.button("➡️", use_container_width=True, key="right"):
             try_move(0, 1); st.rerun()
@@ -232,8 +257,10 @@ if not st.session_state.mz_over:
 
 else:
     if st.session_state.mz_won:
-        st.success(f"🏆 Gefeliciteerd! **{name}** heeft het doolhof uitgelopen in **{st.session_state.mz_steps} stappen**!")
+        st.success(f"🏆 Gefeliciteerd! **{name}** heeft het doolhof uitgelopen in **{st.session_state.mz_steps} stappen** (par {st.session_state.mz_par})!")
         st.info(f"🎉 **{name}** is toegevoegd aan je Pokédex!")
+        if st.session_state.mz_place:
+            st.caption(f"🏅 Plek {st.session_state.mz_place} in het klassement voor dit formaat.")
         st.balloons()
     else:
         st.error(f"💀 **{name}** heeft alle levens verloren. Probeer opnieuw!")
@@ -252,6 +279,7 @@ with st.expander("📖 Legenda"):
 | ⬜ | Vrij pad |
 | 🔥💧🪨⚡🌵 | Gevaar (-1 leven) |
 | ⭐ | Bonus (+1 leven) |
+| 🟨 | Beste route (als ingeschakeld) |
 """)
 
 # ── sidebar ────────────────────────────────────────────────────────────────────
@@ -262,6 +290,27 @@ with st.sidebar:
         new_maze(pokemon_id=chosen)
         st.rerun()
     st.markdown("---")
+    st.markdown("### Doolhof")
+    st.select_slider("Rijen", options=SIZES, value=DEFAULT_SIZE, key="mz_rows_choice")
+    st.select_slider("Kolommen", options=SIZES, value=DEFAULT_SIZE, key="mz_cols_choice")
+    st.selectbox("Generator", options=list(ALGORITHM_LABELS), format_func=ALGORITHM_LABELS.get,
+                 key="mz_algo_choice")
+    st.selectbox("Moeilijkheid", options=list(DIFFICULTIES), index=list(DIFFICULTIES).index(DEFAULT_DIFFICULTY),
+                 format_func=str.capitalize, key="mz_diff_choice")
+    POOL.warm(maze_key())  # the next maze with these settings is ready before it is asked for
+    st.caption("Nieuwe instellingen gelden vanaf het volgende doolhof.")
+    st.toggle("🧭 Toon beste route", key="mz_show_route")
     if st.button("🔄 Nieuw doolhof", use_container_width=True):
         new_maze(st.session_state.mz_pokemon_id)
         st.rerun()
+
+    with st.expander("⚙️ Doolhof-voorraad"):
+        pool = POOL.stats()
+        lo, hi = DIFFICULTIES[maze_key()[3]]["band"]
+        st.caption(
+            f"Klaar voor deze instellingen: {pool['depth'].get(maze_key(), 0)} · "
+            f"goedgekeurd: {pool['acceptance'].get(maze_key(), 0):.0%} (doel: {lo}–{hi} onvermijdbare gevaren) · "
+            f"direct uit voorraad: {pool['hit_rate']:.0%} ({pool['hits']}/{pool['hits'] + pool['misses']}) · "
+            f"{pool['accepted']}/{pool['candidates']} kandidaten in {pool['refills']} aanvullingen · "
+            f"{pool['candidates_per_s']:.0f} kandidaten/s · gem. bouwtijd: {pool['avg_build_ms']:.0f} ms"
+        )
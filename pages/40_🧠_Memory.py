@@ -2,54 +2,127 @@
 Pokémon Memory
 ==============
 Een klassiek memory-spel met Pokémon-sprites.
-• Kies een moeilijkheidsgraad (4×2, 4×3 of 4×4 kaarten)
+• Kies een moeilijkheidsgraad (van 4×2 kaarten tot alle Pokémon)
 • Klik op twee kaarten om ze om te draaien
 • Gevonden paren blijven zichtbaar
 • Win als alle paren gevonden zijn
+• Speel eventueel tegen een computerspeler die om de beurt meespeelt
 """
 import streamlit as st
+import pandas as pd
 import random
 from utils.styles import inject_custom_css
+from utils.metrics import instrument
+from utils.profile import player_profile
 from utils.pokemon_data import POKEMON, POKEMON_IDS, sprite_url
+from utils import sprites
 from utils.caught_pokemon import mark_caught
+from utils.memory_engine import DOWN, MemoryGame, bot_turn, make_bot
+from utils.leaderboard import get_leaderboard
 
 st.set_page_config(page_title="Pokémon Memory", page_icon="🧠", layout="wide")
+instrument("memory")
 inject_custom_css()
+profile = player_profile()
 
 # ── difficulty presets ─────────────────────────────────────────────────────────
+# par: median attempts of a player with perfect memory (python -m utils.memory_sim)
 DIFFICULTIES = {
-    "Makkelijk (4×2)":  {"pairs": 4,  "cols": 4},
-    "Normaal (4×3)":    {"pairs": 6,  "cols": 4},
-    "Moeilijk (4×4)":   {"pairs": 8,  "cols": 4},
+    "Makkelijk (4×2)":  {"pairs": 4,  "cols": 4,  "par": 6},
+    "Normaal (4×3)":    {"pairs": 6,  "cols": 4,  "par": 9},
+    "Moeilijk (4×4)":   {"pairs": 8,  "cols": 4,  "par": 12},
+    "Expert (8×6)":     {"pairs": 24, "cols": 8,  "par": 38},
+    "Meester (10×10)":  {"pairs": 50, "cols": 10, "par": 80},
+    "Alles (13×18)":    {"pairs": len(POKEMON_IDS), "cols": 13, "par": 188},
 }
 
-CARD_BACK = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/items/poke-ball.png"
+OPPONENTS = {
+    None:      "👤 Niemand (solo)",
+    "random":  "🎲 Gokker",
+    "limited": "🤔 Vergeetachtig",
+    "perfect": "🐘 Olifantengeheugen",
+}
+
+CARD_BACK = sprites.resolve(sprites.POKE_BALL)
 
 
-def new_memory(difficulty: str):
+def new_memory(difficulty: str, opponent: str | None = None):
     cfg   = DIFFICULTIES[difficulty]
     pairs = cfg["pairs"]
     cols  = cfg["cols"]
 
-    chosen_ids = random.sample(POKEMON_IDS, pairs)
-    card_ids   = chosen_ids * 2
-    random.shuffle(card_ids)
-
-    st.session_state.m_cards     = card_ids          # list of pokemon_id per card
-    st.session_state.m_flipped   = [False] * len(card_ids)
-    st.session_state.m_matched   = [False] * len(card_ids)
+    st.session_state.m_game      = MemoryGame.deal(pairs, POKEMON_IDS)
     st.session_state.m_selected  = []               # indices currently face-up (max 2)
-    st.session_state.m_attempts  = 0
-    st.session_state.m_pairs_found = 0
+    st.session_state.m_clicks    = 0                # a fresh board widget per click
+    st.session_state.m_attempts  = 0                # the player's own attempts
+    st.session_state.m_pairs_found = 0              # ... and pairs
     st.session_state.m_total_pairs = pairs
     st.session_state.m_cols      = cols
     st.session_state.m_difficulty = difficulty
+    st.session_state.m_opponent  = opponent
+    st.session_state.m_bot       = make_bot(opponent) if opponent else None
+    st.session_state.m_bot_pairs = 0
+    st.session_state.m_bot_moves = []               # the bot's last turn: (first, second, matched)
     st.session_state.m_over      = False
     st.session_state.m_mismatch  = False            # show mismatch feedback
+    st.session_state.m_place     = None             # leaderboard place of a finished solo game
+
+
+def flip(idx: int):
+    """Turn card ``idx`` face up and score the pair once two are up; after a
+    miss the bot (if any) takes its turn."""
+    s = st.session_state
+    game = s.m_game
+    if game.state[idx] != DOWN or idx in s.m_selected or len(s.m_selected) >= 2 or s.m_mismatch:
+        return
+    s.m_selected.append(idx)
+    s.m_bot_moves = []
+    if s.m_bot:
+        s.m_bot.observe(idx, game.cards[idx])
+    if len(s.m_selected) == 2:
+        i1, i2 = s.m_selected
+        s.m_attempts += 1
+        if game.turn(i1, i2):
+            # Match!
+            s.m_selected = []
+            s.m_pairs_found += 1
+            mark_caught(game.cards[i1], profile)
+        else:
+            s.m_mismatch = True
+            if s.m_bot:
+                s.m_bot_moves = bot_turn(game, s.m_bot)
+                s.m_bot_pairs += sum(matched for _, _, matched in s.m_bot_moves)
+        s.m_over = game.over
+        if s.m_over and not s.m_bot:
+            s.m_place = get_leaderboard().record("memory", s.m_difficulty, profile, s.m_attempts)
+
+
+def on_board_select():
+    """Board callback: the clicked cell is a card index."""
+    s = st.session_state
+    cells = s[f"m_board_{s.m_clicks}"].selection.cells
+    s.m_clicks += 1  # new widget key, so the same cell can be clicked again later
+    if cells:
+        row, col = cells[0]
+        idx = row * s.m_cols + int(col) - 1
+        if idx < len(s.m_game.cards):
+            flip(idx)
+
+
+def board(card_px: int) -> pd.DataFrame:
+    """The board as one table of card images (the Poké Ball when face down)."""
+    s = st.session_state
+    state, selected = s.m_game.state, s.m_selected
+    images = [CARD_BACK if state[idx] == DOWN and idx not in selected else sprite_url(pid, card_px)
+              for idx, pid in enumerate(s.m_game.cards)]
+    n_cols = s.m_cols
+    images += [None] * (-len(images) % n_cols)
+    rows = [images[r:r + n_cols] for r in range(0, len(images), n_cols)]
+    return pd.DataFrame(rows, columns=[str(c + 1) for c in range(n_cols)])
 
 
 # ── init ───────────────────────────────────────────────────────────────────────
-if "m_cards" not in st.session_state:
+if "m_game" not in st.session_state:
     new_memory("Normaal (4×3)")
 
 # ── UI ─────────────────────────────────────────────────────────────────────────
@@ -58,7 +131,10 @@ st.caption("Vind alle overeenkomende Pokémon-paren!")
 
 # Stats row
 s1, s2, s3, s4 = st.columns(4)
-s1.metric("Paren gevonden", f"{st.session_state.m_pairs_found}/{st.session_state.m_total_pairs}")
+if st.session_state.m_bot:
+    s1.metric("Stand (jij – bot)", f"{st.session_state.m_pairs_found} – {st.session_state.m_bot_pairs}")
+else:
+    s1.metric("Paren gevonden", f"{st.session_state.m_pairs_found}/{st.session_state.m_total_pairs}")
 s2.metric("Pogingen", st.session_state.m_attempts)
 if st.session_state.m_attempts > 0:
     acc = st.session_state.m_pairs_found / st.session_state.m_attempts * 100
@@ -73,83 +149,85 @@ st.markdown("---")
 if st.session_state.m_mismatch:
     sel = st.session_state.m_selected
     if len(sel) == 2:
-        n1 = POKEMON[st.session_state.m_cards[sel[0]]]
-        n2 = POKEMON[st.session_state.m_cards[sel[1]]]
+        n1 = POKEMON[st.session_state.m_game.cards[sel[0]]]
+        n2 = POKEMON[st.session_state.m_game.cards[sel[1]]]
         st.warning(f"❌ Geen match: **{n1}** en **{n2}** — kaarten worden teruggedraaid.")
     # Flip back
-    for idx in st.session_state.m_selected:
-        st.session_state.m_flipped[idx] = False
     st.session_state.m_selected = []
     st.session_state.m_mismatch = False
 
-# ── card grid ──────────────────────────────────────────────────────────────────
-cards   = st.session_state.m_cards
-flipped = st.session_state.m_flipped
-matched = st.session_state.m_matched
-n_cols  = st.session_state.m_cols
+# ── the bot's turn ─────────────────────────────────────────────────────────────
+if st.session_state.m_bot_moves:
+    cards = st.session_state.m_game.cards
+    lines = [
+        f"**{POKEMON[cards[a]]}** en **{POKEMON[cards[b]]}** — {'✅ match!' if matched else '❌ geen match'}"
+        for a, b, matched in st.session_state.m_bot_moves
+    ]
+    st.info(f"🤖 {OPPONENTS[st.session_state.m_opponent]} draaide om: " + " · ".join(lines))
 
+# ── card grid ──────────────────────────────────────────────────────────────────
+# One dataframe widget for the whole board: a click selects a cell and the
+# callback flips that card, so a rerun costs the same for 8 or 234 cards.
+# Trade-off: an ImageColumn cell is a whole image URL and cannot be cut out
+# of the sprite atlas (utils.atlas), so the board loads one sprite per species
+# turned up plus the Poké Ball, each once per session thanks to the browser
+# cache, where the per-card st.columns board loaded only the atlas. Measured
+# with every card up (4×4: 31 ms rerun, 3.6 KB sent, 9 images; the per-card
+# board 31 ms, 5.6 KB, 1 image; 13×18: 52 ms, 17 KB, 118 images).
 if not st.session_state.m_over:
-    for row_start in range(0, len(cards), n_cols):
-        row_cards = list(range(row_start, min(row_start + n_cols, len(cards))))
-        cols = st.columns(len(row_cards))
-        for col, idx in zip(cols, row_cards):
-            pid = cards[idx]
-            with col:
-                if matched[idx]:
-                    # Permanently revealed
-                    st.image(sprite_url(pid), width=90)
-                    st.markdown(
-                        f"<p style='text-align:center;font-size:0.7rem;color:#4caf50;'>"
-                        f"✅ {POKEMON[pid]}</p>",
-                        unsafe_allow_html=True,
-                    )
-                elif flipped[idx]:
-                    # Currently face-up (selected)
-                    st.image(sprite_url(pid), width=90)
-                    st.markdown(
-                        f"<p style='text-align:center;font-size:0.7rem;color:#ff9800;'>"
-                        f"❓ {POKEMON[pid]}</p>",
-                        unsafe_allow_html=True,
-                    )
-                else:
-                    # Face-down card: show pokeball button
-                    if st.button("🔵", key=f"card_{idx}", use_container_width=True,
-                                 help="Klik om om te draaien"):
-                        # Only allow if fewer than 2 cards are selected
-                        if len(st.session_state.m_selected) < 2 and not st.session_state.m_mismatch:
-                            st.session_state.m_flipped[idx] = True
-                            st.session_state.m_selected.append(idx)
-
-                            if len(st.session_state.m_selected) == 2:
-                                i1, i2 = st.session_state.m_selected
-                                st.session_state.m_attempts += 1
-                                if cards[i1] == cards[i2]:
-                                    # Match!
-                                    st.session_state.m_matched[i1] = True
-                                    st.session_state.m_matched[i2] = True
-                                    st.session_state.m_selected = []
-                                    st.session_state.m_pairs_found += 1
-                                    mark_caught(cards[i1])
-                                    if st.session_state.m_pairs_found >= st.session_state.m_total_pairs:
-                                        st.session_state.m_over = True
-                                else:
-                                    st.session_state.m_mismatch = True
-                        st.rerun()
+    n_cards = len(st.session_state.m_game.cards)
+    card_px = 96 if n_cards <= 16 else 64 if n_cards <= 48 else 48
+    n_rows  = -(-n_cards // st.session_state.m_cols)
+    st.dataframe(
+        board(card_px),
+        key=f"m_board_{st.session_state.m_clicks}",
+        on_select=on_board_select,
+        selection_mode="single-cell",
+        hide_index=True,
+        row_height=card_px,
+        height=n_rows * card_px + 40,
+        width="content",
+        column_config={
+            str(c + 1): st.column_config.ImageColumn(width=card_px)
+            for c in range(st.session_state.m_cols)
+        },
+    )
+    if st.session_state.m_selected:
+        idx = st.session_state.m_selected[0]
+        row, col = divmod(idx, st.session_state.m_cols)
+        st.caption(f"❓ Omgedraaid: **{POKEMON[st.session_state.m_game.cards[idx]]}** "
+                   f"(rij {row + 1}, kolom {col + 1}) — kies de tweede kaart.")
 else:
     attempts = st.session_state.m_attempts
     pairs    = st.session_state.m_total_pairs
-    st.success(f"🏆 Gefeliciteerd! Je hebt alle **{pairs} paren** gevonden in **{attempts} pogingen**!")
-    st.balloons()
+    par      = DIFFICULTIES[st.session_state.m_difficulty]["par"]
+    mine, theirs = st.session_state.m_pairs_found, st.session_state.m_bot_pairs
+    if not st.session_state.m_bot:
+        st.success(f"🏆 Gefeliciteerd! Je hebt alle **{pairs} paren** gevonden in **{attempts} pogingen**! "
+                   f"(Met een perfect geheugen lukt het in ongeveer {par}.)")
+        if st.session_state.m_place:
+            st.caption(f"🏅 Plek {st.session_state.m_place} in het klassement voor deze moeilijkheidsgraad.")
+        st.balloons()
+    elif mine > theirs:
+        st.success(f"🏆 Gewonnen van {OPPONENTS[st.session_state.m_opponent]} met **{mine} – {theirs}**!")
+        st.balloons()
+    elif mine == theirs:
+        st.info(f"🤝 Gelijkspel: **{mine} – {theirs}**.")
+    else:
+        st.error(f"🤖 {OPPONENTS[st.session_state.m_opponent]} wint met **{theirs} – {mine}**. Probeer opnieuw!")
 
 st.markdown("---")
 
 # ── controls ───────────────────────────────────────────────────────────────────
-c1, c2 = st.columns([2, 1])
+c1, c2, c3 = st.columns([2, 2, 1])
 with c1:
     diff = st.selectbox("Moeilijkheidsgraad", list(DIFFICULTIES.keys()),
                         index=list(DIFFICULTIES.keys()).index(st.session_state.m_difficulty))
 with c2:
+    opponent = st.selectbox("Tegenstander", list(OPPONENTS), format_func=OPPONENTS.get,
+                            index=list(OPPONENTS).index(st.session_state.m_opponent))
+with c3:
     st.markdown("<div style='margin-top:28px;'></div>", unsafe_allow_html=True)
     if st.button("🔄 Nieuw spel", type="primary", use_container_width=True):
-        new_memory(diff)
+        new_memory(diff, opponent)
         st.rerun()
@@ -9,16 +9,24 @@ Overzicht van alle Pokémon die je hebt gevangen via de andere spellen:
 """
 import streamlit as st
 from utils.styles import inject_custom_css
-from utils.pokemon_data import POKEMON, POKEMON_IDS, sprite_url
+from utils.metrics import instrument
+from utils.profile import player_profile
+from utils.pokemon_data import POKEMON, POKEMON_IDS
+from utils.grid import card_grid_html, paginate
+from utils.atlas import atlas_css
+from utils.dex import SORT_OPTIONS, caught_card, display_list, missing_card
 from utils.caught_pokemon import load_caught, reset_caught
 
 st.set_page_config(page_title="Pokédex", page_icon="📋", layout="wide")
+instrument("pokedex")
 inject_custom_css()
+st.markdown(atlas_css(), unsafe_allow_html=True)  # the sprite sheet, named once for every card below
+profile = player_profile()
 
 st.markdown("## 📋 Jouw Pokédex")
 st.caption("Alle Pokémon die je hebt gevangen via de verschillende spellen.")
 
-caught = load_caught()
+caught = load_caught(profile)
 total_species = len(caught)
 total_catches = sum(caught.values())
 total_possible = len(POKEMON_IDS)
@@ -41,63 +49,32 @@ else:
     with col_search:
         search = st.text_input("🔍 Zoek op naam", placeholder="bijv. Pikachu")
     with col_sort:
-        sort_by = st.selectbox("Sorteren op", ["Pokédex #", "Naam", "Meest gevangen"])
+        sort_by = st.selectbox("Sorteren op", SORT_OPTIONS)
 
-    # Build display list
-    display = [(pid, POKEMON[pid], caught[pid]) for pid in caught if pid in POKEMON]
-
-    if search:
-        display = [(pid, name, cnt) for pid, name, cnt in display
-                   if search.lower() in name.lower()]
-
-    if sort_by == "Naam":
-        display.sort(key=lambda x: x[1])
-    elif sort_by == "Meest gevangen":
-        display.sort(key=lambda x: x[2], reverse=True)
-    else:
-        display.sort(key=lambda x: x[0])
+    display = display_list(caught, search, sort_by)
 
     st.markdown(f"**{len(display)} Pokémon gevonden**")
     st.markdown("---")
 
     # ── card grid ──────────────────────────────────────────────────────────────
     GRID_COLS = 6
-    for row_start in range(0, len(display), GRID_COLS):
-        row = display[row_start: row_start + GRID_COLS]
-        cols = st.columns(GRID_COLS)
-        for col, (pid, name, cnt) in zip(cols, row):
-            with col:
-                st.image(sprite_url(pid), width=90)
-                st.markdown(
-                    f"<p style='text-align:center;font-size:0.75rem;margin:0;'>"
-                    f"<strong>#{pid}</strong><br>{name}</p>"
-                    f"<p style='text-align:center;font-size:0.7rem;color:#aaa;margin:0;'>"
-                    f"x{cnt} gevangen</p>",
-                    unsafe_allow_html=True,
-                )
+    PAGE_SIZE = GRID_COLS * 8
+    cards = [caught_card(pid, name, cnt) for pid, name, cnt in paginate(display, PAGE_SIZE, key="dex_page")]
+    st.markdown(card_grid_html(cards, GRID_COLS), unsafe_allow_html=True)
 
 # ── not yet caught ─────────────────────────────────────────────────────────────
-with st.expander("👻 Nog niet gevangen"):
-    missing = [pid for pid in POKEMON_IDS if pid not in caught]
+# A toggle rather than an expander: an expander's body is rendered (and sent)
+# even while collapsed, the toggle only builds the silhouettes when opened.
+missing = [pid for pid in POKEMON_IDS if pid not in caught]
+if st.toggle(f"👻 Nog niet gevangen ({len(missing)})"):
     if not missing:
         st.success("🏆 Je hebt alle Pokémon gevangen!")
     else:
         GRID_COLS = 6
-        for row_start in range(0, len(missing), GRID_COLS):
-            row = missing[row_start: row_start + GRID_COLS]
-            cols = st.columns(GRID_COLS)
-            for col, pid in zip(cols, row):
-                with col:
-                    # Silhouette
-                    st.markdown(
-                        f"<div style='text-align:center;'>"
-                        f"<img src='{sprite_url(pid)}' width='80' "
-                        f"style='filter:brightness(0);opacity:0.4;'/>"
-                        f"<p style='font-size:0.7rem;color:#555;margin:0;'>???</p></div>",
-                        unsafe_allow_html=True,
-                    )
+        cards = [missing_card(pid) for pid in paginate(missing, GRID_COLS * 8, key="dex_missing_page")]
+        st.markdown(card_grid_html(cards, GRID_COLS), unsafe_allow_html=True)
 
 st.markdown("---")
 if st.button("🗑️ Reset Pokédex", type="secondary"):
-    reset_caught()
+    reset_caught(profile)
     st.rerun()
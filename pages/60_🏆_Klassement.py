@@ -0,0 +1,56 @@
+"""
+Klassement
+==========
+De beste resultaten van alle spelers, per spel:
+  • Wie is dat Pokémon? → langste reeks goede antwoorden
+  • Gevechtsspel       → meeste overwinningen op rij
+  • Parcours           → minste stappen, per formaat en moeilijkheid
+  • Memory             → minste pogingen, per moeilijkheidsgraad (solo)
+"""
+import re
+import time
+
+import pandas as pd
+import streamlit as st
+from utils.styles import inject_custom_css
+from utils.metrics import instrument
+from utils.profile import player_profile
+from utils.leaderboard import GAMES, get_leaderboard
+
+st.set_page_config(page_title="Klassement", page_icon="🏆", layout="wide")
+instrument("klassement")
+inject_custom_css()
+profile = player_profile()
+
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+
+def variant_order(variant: str) -> tuple:
+    """Boards like "9×9 normaal" by size, other names alphabetically."""
+    size = re.match(r"(\d+)×(\d+)", variant)
+    return (int(size[1]) * int(size[2]), variant) if size else (0, variant)
+
+
+def score_table(rows: list[tuple[int, str, float]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [(MEDALS.get(i, str(i)), f"👉 {name}" if name == profile else name, score,
+          time.strftime("%d-%m-%Y %H:%M", time.localtime(at)))
+         for i, (score, name, at) in enumerate(rows, start=1)],
+        columns=["Plek", "Speler", "Score", "Datum"],
+    )
+
+
+st.markdown("## 🏆 Klassement")
+st.caption(f"De top {get_leaderboard().k} per spel. Jouw resultaten staan gemarkeerd met 👉.")
+
+board = get_leaderboard()
+for tab, (game, (label, _)) in zip(st.tabs([label for label, _ in GAMES.values()]), GAMES.items()):
+    with tab:
+        variants = sorted(board.variants(game), key=lambda v: variant_order(v or ""))
+        if not variants:
+            st.info("Nog geen resultaten. Speel een potje om op het klassement te komen!")
+            continue
+        variant = variants[0]
+        if len(variants) > 1 or variant is not None:
+            variant = st.selectbox("Bord", variants, key=f"lb_{game}")
+        st.dataframe(score_table(board.top(game, variant)), hide_index=True, width="stretch")
@@ -0,0 +1,81 @@
+"""Battle rules, and the exact odds of ``utils.battle_odds`` against simulated battles."""
+import random
+
+import numpy as np
+import pytest
+
+from utils.battle_ai import TranspositionTable, hard_policy
+from utils.battle_engine import ATTACK, DEFEND, SPECIAL, calc_damage, damage_range, play_battle, shielded
+from utils.battle_odds import OddsTable
+from utils.battle_sim import simulate
+from utils.species import species_table
+
+WEAK = {"hp": 40, "attack": 20, "defense": 60}
+STRONG = {"hp": 90, "attack": 80, "defense": 30}
+
+
+# ── rules ──────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("move", [ATTACK, SPECIAL])
+@pytest.mark.parametrize("attacker, defender", [(WEAK, STRONG), (STRONG, WEAK), (WEAK, WEAK)])
+def test_calc_damage_covers_its_range(attacker, defender, move):
+    lo, hi = damage_range(attacker, defender, move)
+    rng = random.Random(0)
+    rolls = {calc_damage(attacker, defender, move, rng) for _ in range(5000)}
+    assert 1 <= lo < hi
+    assert rolls == set(range(lo, hi + 1))
+
+
+def test_damage_range_formulas():
+    # aanval: base = max(1, 20 - 15) = 5; speciaal: base = max(5, 30 - 10) = 20
+    assert damage_range(WEAK, STRONG, ATTACK) == (1, 15)
+    assert damage_range(WEAK, STRONG, SPECIAL) == (15, 35)
+    assert damage_range(STRONG, WEAK, ATTACK) == (45, 60)
+
+
+def test_defend_does_no_damage():
+    assert damage_range(STRONG, WEAK, DEFEND) == (0, 0)
+    assert calc_damage(STRONG, WEAK, DEFEND) == 0
+
+
+@pytest.mark.parametrize("raw, defending, expected", [
+    (40, False, 40), (40, True, 20), (7, True, 3), (1, True, 1), (1, False, 1), (0, False, 1),
+])
+def test_shielded(raw, defending, expected):
+    assert shielded(raw, defending) == expected
+
+
+# ── exact odds ─────────────────────────────────────────────────────────────────
+
+def test_odds_boundaries():
+    odds = OddsTable(WEAK, STRONG)
+    assert odds.win_chance(10, 0) == 1.0
+    assert odds.win_chance(0, 10) == 0.0
+    assert all(0.0 <= v <= 1.0 for row in odds.V for v in row)
+
+
+def test_optimal_play_is_at_least_as_good_as_any_policy():
+    optimal = OddsTable(WEAK, STRONG).win_chance(WEAK["hp"], STRONG["hp"])
+    for policy in ("greedy", "random", ATTACK, SPECIAL):
+        assert optimal >= OddsTable(WEAK, STRONG, policy).win_chance(WEAK["hp"], STRONG["hp"]) - 1e-12
+
+
+@pytest.mark.parametrize("policy", ["greedy", "random", ATTACK])
+@pytest.mark.parametrize("a, b", [(0, 1), (3, 10), (24, 5)])
+def test_odds_agree_with_simulator(a, b, policy):
+    table = species_table()
+    exact = OddsTable(table.stats(table.ids[a]), table.stats(table.ids[b]), policy)
+    p = exact.win_chance(table.hp[a], table.hp[b])
+    n = 50_000
+    sim = simulate(np.full(n, a), np.full(n, b), policy, seed=1).mean()
+    assert abs(sim - p) <= 4 * (p * (1 - p) / n) ** 0.5 + 1e-3
+
+
+def test_hard_odds_agree_with_played_battles():
+    player, enemy = STRONG, {"hp": 80, "attack": 60, "defense": 50}
+    p = OddsTable(player, enemy, ATTACK, enemy_ai="hard").win_chance(player["hp"], enemy["hp"])
+    hard = hard_policy(player, enemy, table=TranspositionTable())
+    rng = random.Random(2)
+    n = 4000
+    wins = sum(play_battle(player, enemy, lambda php, ehp: ATTACK, rng, choose_enemy=hard) for _ in range(n))
+    assert abs(wins / n - p) <= 4 * (p * (1 - p) / n) ** 0.5 + 1e-3
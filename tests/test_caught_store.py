@@ -0,0 +1,55 @@
+"""The JSON snapshot + journal store: what survives a restart, a crash and a compaction."""
+import json
+import os
+
+from utils.caught_store import DEFAULT_PROFILE, JsonStore, SqliteStore
+
+
+def test_catches_survive_a_restart(tmp_path):
+    JsonStore(str(tmp_path)).add(DEFAULT_PROFILE, [25, 25, 6])
+    assert JsonStore(str(tmp_path)).load() == {25: 2, 6: 1}
+
+
+def test_snapshot_and_journal_are_combined(tmp_path):
+    store = JsonStore(str(tmp_path))
+    (tmp_path / "caught.json").write_text(json.dumps({"generation": 3, "caught": {"1": 4}}))
+    (tmp_path / "caught.3.log").write_text("1\n2\n")
+    (tmp_path / "caught.2.log").write_text("99\n")  # an older generation, already folded in
+    assert store.load() == {1: 5, 2: 1}
+
+
+def test_a_torn_journal_line_is_ignored(tmp_path):
+    store = JsonStore(str(tmp_path))
+    store.add(DEFAULT_PROFILE, [1, 2])
+    with open(store.journal_path(DEFAULT_PROFILE, 0), "ab") as f:
+        f.write(b"15")  # crash halfway through "150\n"
+    assert store.load() == {1: 1, 2: 1}
+    store.add(DEFAULT_PROFILE, [3])
+    assert JsonStore(str(tmp_path)).load() == {1: 1, 2: 1, 3: 1}
+
+
+def test_compaction_keeps_every_catch(tmp_path):
+    store = JsonStore(str(tmp_path), compact_bytes=64)
+    for pid in range(1, 101):
+        store.add(DEFAULT_PROFILE, [pid, 1])
+    with open(store.snapshot_path()) as f:
+        generation = json.load(f)["generation"]
+    assert generation > 1
+    assert set(os.listdir(tmp_path)) <= {"caught.json", f"caught.{generation}.log"}  # old journals are gone
+    assert JsonStore(str(tmp_path)).load() == {1: 101, **{pid: 1 for pid in range(2, 101)}}
+
+
+def test_legacy_flat_snapshot(tmp_path):
+    (tmp_path / "caught.json").write_text(json.dumps({"25": 3}))
+    assert JsonStore(str(tmp_path)).load() == {25: 3}
+
+
+def test_profiles_and_reset(tmp_path):
+    for store in (JsonStore(str(tmp_path / "json")), SqliteStore(str(tmp_path / "sqlite"))):
+        store.add(DEFAULT_PROFILE, [1])
+        store.add("Ash Ketchum", [2, 2])
+        before = store.version("Ash Ketchum")
+        store.reset("Ash Ketchum")
+        assert store.version("Ash Ketchum") != before
+        assert store.load("Ash Ketchum") == {}
+        assert store.load() == {1: 1}
@@ -0,0 +1,53 @@
+"""Leaderboard ranking: direction per game, ties, the top-K cut-off and streak entries."""
+import pytest
+
+from utils.leaderboard import Leaderboard, new_entry
+
+
+@pytest.fixture
+def board(tmp_path):
+    return Leaderboard(str(tmp_path), k=3)
+
+
+def test_higher_wins(board):
+    assert board.record("raden", None, "a", 5) == 1
+    assert board.record("raden", None, "b", 9) == 1
+    assert board.record("raden", None, "c", 7) == 2
+    assert [(score, who) for score, who, _ in board.top("raden")] == [(9, "b"), (7, "c"), (5, "a")]
+
+
+def test_lower_wins(board):
+    board.record("parcours", "21×21", "a", 40)
+    assert board.record("parcours", "21×21", "b", 30) == 1
+    assert [score for score, _, _ in board.top("parcours", "21×21")] == [30, 40]
+
+
+def test_ties_go_to_the_earlier_result(board):
+    board.record("memory", None, "a", 10)
+    assert board.record("memory", None, "b", 10) == 2
+    assert [who for _, who, _ in board.top("memory")] == ["a", "b"]
+
+
+def test_only_the_top_k_are_kept(board):
+    for score in (5, 6, 7):
+        board.record("raden", None, "a", score)
+    assert board.record("raden", None, "b", 5) is None  # a tie with the last place does not make it
+    assert board.record("raden", None, "b", 8) == 1
+    assert [score for score, _, _ in board.top("raden")] == [8, 7, 6]
+
+
+def test_a_streak_improves_in_place(board):
+    entry = new_entry()
+    for length in (1, 2, 3):
+        board.record("gevecht", None, "a", length, entry)
+    assert board.record("gevecht", None, "a", 2, entry) == 1  # no improvement, same place
+    board.record("gevecht", None, "b", 4)
+    assert [(score, who) for score, who, _ in board.top("gevecht")] == [(4, "b"), (3, "a")]
+
+
+def test_boards_are_separate(board):
+    board.record("memory", "Normaal (4×3)", "a", 12)
+    board.record("memory", None, "b", 20)
+    assert sorted(board.variants("memory"), key=str) == [None, "Normaal (4×3)"]
+    board.reset("memory")
+    assert board.top("memory") == [] and board.variants("memory") == []
@@ -0,0 +1,78 @@
+"""Maze generators make perfect mazes; playable mazes have a way through."""
+import random
+from collections import deque
+
+import pytest
+
+from utils.maze import (ALGORITHMS, CELL_FINISH, CELL_HAZARD, CELL_START, CELL_WALL, DIFFICULTIES,
+                        UNREACHABLE, build_maze, build_valid_maze, distance_field, generate, in_band, route)
+
+SIZES = [(1, 1), (3, 3), (5, 11), (21, 21), (31, 17)]
+
+
+def _open(grid, rows: int, cols: int) -> set[tuple[int, int]]:
+    return {divmod(i, cols) for i in range(rows * cols) if grid[i] != CELL_WALL}
+
+
+def _reachable(squares: set, start: tuple[int, int]) -> set:
+    seen, queue = {start}, deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for nxt in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if nxt in squares and nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+
+@pytest.mark.parametrize("rows, cols", SIZES)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_perfect_maze(algorithm, rows, cols):
+    for seed in range(5):
+        grid = generate(rows, cols, algorithm, random.Random(seed))
+        assert len(grid) == rows * cols
+        squares = _open(grid, rows, cols)
+        rooms = {(r, c) for r in range(0, rows, 2) for c in range(0, cols, 2)}
+        assert rooms <= squares
+        assert all(r % 2 == 0 or c % 2 == 0 for r, c in squares)  # pillars stay walls
+        # every square reachable, and a tree: one passage fewer than squares, so no loops
+        assert _reachable(squares, (0, 0)) == squares
+        edges = sum((r + 1, c) in squares for r, c in squares) + sum((r, c + 1) in squares for r, c in squares)
+        assert edges == len(squares) - 1
+
+
+@pytest.mark.parametrize("rows, cols", [(0, 5), (4, 5), (5, 6)])
+def test_even_sizes_are_rejected(rows, cols):
+    with pytest.raises(ValueError):
+        generate(rows, cols)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_playable_maze(algorithm, difficulty):
+    rows = cols = 21
+    maze = build_maze(rows, cols, algorithm, difficulty, random.Random(3))
+    grid = maze["grid"]
+    assert grid[0] == CELL_START and grid[-1] == CELL_FINISH
+    assert maze["plan"] == bytes(grid)
+    assert {divmod(i, cols) for i in range(rows * cols) if grid[i] == CELL_HAZARD} == set(maze["hazards"])
+    assert maze["life_cost"] != UNREACHABLE
+    path = route(maze["dist"], grid, rows, cols, (0, 0))
+    assert path[0] == (0, 0) and path[-1] == (rows - 1, cols - 1)
+    assert len(path) - 1 == maze["par"]
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+    assert all(grid[r * cols + c] != CELL_WALL for r, c in path)
+
+
+def test_distance_field_marks_walls_unreachable():
+    grid = generate(11, 11, "kruskal", random.Random(4))
+    dist = distance_field(grid, 11, 11, (10, 10))
+    assert dist[10 * 11 + 10] == 0
+    assert all((dist[i] == UNREACHABLE) == (grid[i] == CELL_WALL) for i in range(len(grid)))
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_valid_maze_is_in_band(difficulty):
+    maze, tries = build_valid_maze(21, 21, "backtracker", difficulty, random.Random(5))
+    assert tries >= 1
+    assert in_band(maze, difficulty)
@@ -0,0 +1,53 @@
+"""The question deck: rounds without repeats, spaced retries, never the same species twice in a row."""
+import random
+
+import pytest
+
+from utils.quiz_deck import CHOICES, RETRY_GAP, QuestionDeck
+
+IDS = list(range(1, 51))
+
+
+def test_a_round_asks_every_species_once():
+    deck = QuestionDeck(IDS, random.Random(0))
+    for _ in range(3):
+        assert sorted(deck.draw().pokemon_id for _ in IDS) == IDS
+
+
+def test_choices_hold_the_answer_and_distinct_distractors():
+    deck = QuestionDeck(IDS, random.Random(1))
+    for _ in range(200):
+        q = deck.draw()
+        assert len(q.choices) == CHOICES == len(set(q.choices))
+        assert q.pokemon_id in q.choices
+        assert set(q.choices) <= set(IDS)
+
+
+def test_a_miss_comes_back_after_retry_gap_questions():
+    deck = QuestionDeck(IDS, random.Random(2))
+    asked = [deck.draw().pokemon_id for _ in range(3)]
+    deck.record(asked[-1], correct=False)
+    asked += [deck.draw().pokemon_id for _ in range(RETRY_GAP + 1)]
+    assert asked[-1] == asked[2]
+    assert asked[2] not in asked[3:-1]
+
+
+def test_a_miss_counts_against_the_species():
+    deck = QuestionDeck(IDS, random.Random(3))
+    deck.record(7, correct=False)
+    deck.record(8, correct=True)
+    assert deck.weight(7) > deck.weight(1) > deck.weight(8)
+    assert deck.accuracy(7) == 0.0 and deck.accuracy(8) == 1.0 and deck.accuracy(1) is None
+
+
+@pytest.mark.parametrize("n", [2, 3, 5])
+@pytest.mark.parametrize("seed", range(20))
+def test_never_twice_in_a_row(n, seed):
+    rng = random.Random(seed)
+    deck = QuestionDeck(list(range(1, n + 1)), rng)
+    last = None
+    for _ in range(300):
+        pid = deck.draw().pokemon_id
+        assert pid != last
+        deck.record(pid, correct=rng.random() < 0.5)
+        last = pid
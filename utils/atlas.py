@@ -0,0 +1,134 @@
+"""
+Sprite atlas: all front sprites and their silhouettes packed into one image,
+so a grid of Pokémon costs a single image fetch.
+
+    python -m utils.atlas            # build static/sprites/atlas.png + atlas.json
+    python -m utils.atlas --webp     # lossless WebP instead of PNG
+
+``sprite_html`` draws one sprite as a ``<div>`` whose background is an offset
+into the atlas, and falls back to a plain ``<img>`` for sprites that are not in
+the atlas (or when no atlas has been built yet). The atlas image itself is
+named once per page, in the ``<style>`` block from ``atlas_css``: without static
+serving it is a data URI of the whole sheet, far too big to repeat per sprite.
+"""
+import argparse
+import json
+import os
+
+from utils import sprites
+from utils.sprite_variants import derive, variant_url
+
+TILE = 96  # PokeAPI front/back sprites are 96×96
+CSS_CLASS = "sprite-atlas"
+ATLAS_VARIANTS = ("front", "silhouette")
+INDEX_FILE = os.path.join(sprites.SPRITE_DIR, "atlas.json")
+
+_index_cache: tuple[int, dict] | None = None  # (index mtime, index)
+
+
+def _key(pokemon_id: int, variant: str) -> str:
+    return f"{variant}/{pokemon_id}"
+
+
+def build_atlas(pokemon_ids, variants=ATLAS_VARIANTS, fmt: str = "png") -> dict:
+    """Pack every (id, variant) whose source sprite is in the store into one
+    atlas image plus a JSON index."""
+    from PIL import Image
+
+    tiles = []
+    for pid in pokemon_ids:
+        for variant in variants:
+            rel = derive(pid, variant, TILE)
+            if rel is not None:
+                tiles.append((_key(pid, variant), rel))
+    cols = max(1, int(len(tiles) ** 0.5 + 0.999))
+    rows = max(1, -(-len(tiles) // cols))
+    sheet = Image.new("RGBA", (cols * TILE, rows * TILE), (0, 0, 0, 0))
+    coords = {}
+    for i, (key, rel) in enumerate(tiles):
+        x, y = (i % cols) * TILE, (i // cols) * TILE
+        with Image.open(sprites.local_path(rel)) as img:
+            sheet.paste(img.convert("RGBA").crop((0, 0, TILE, TILE)), (x, y))
+        coords[key] = [x, y]
+
+    name = f"atlas.{fmt}"
+    if fmt == "webp":
+        sheet.save(sprites.local_path(name), "WEBP", lossless=True, method=6)
+    else:
+        sheet.save(sprites.local_path(name), "PNG", optimize=True)
+    index = {
+        "image": name,
+        "version": os.stat(sprites.local_path(name)).st_mtime_ns,
+        "tile": TILE,
+        "width": sheet.width,
+        "height": sheet.height,
+        "sprites": coords,
+    }
+    with open(INDEX_FILE, "w") as f:
+        json.dump(index, f)
+    return index
+
+
+def load_index() -> dict | None:
+    """The atlas index, re-read only when the file changes; None if there is no atlas."""
+    global _index_cache
+    try:
+        mtime = os.stat(INDEX_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _index_cache is None or _index_cache[0] != mtime:
+        with open(INDEX_FILE) as f:
+            _index_cache = (mtime, json.load(f))
+    return _index_cache[1]
+
+
+def _atlas_url(index: dict) -> str:
+    url = sprites.resolve(index["image"])
+    # bust the browser cache when the atlas is rebuilt
+    return url if url.startswith("data:") else f"{url}?v={index['version']}"
+
+
+def atlas_version(pokemon_id: int, variant: str = "front") -> int | None:
+    """The atlas version if this sprite is in the atlas (its ``sprite_html`` then
+    stays the same until the atlas is rebuilt), else None."""
+    index = load_index()
+    if index and _key(pokemon_id, variant) in index["sprites"]:
+        return index["version"]
+    return None
+
+
+def atlas_css() -> str:
+    """The ``<style>`` block ``sprite_html`` relies on; emit it once per page."""
+    index = load_index()
+    if not index:
+        return ""
+    return (f"<style>.{CSS_CLASS}{{display:inline-block;background-image:url({_atlas_url(index)});"
+            f"background-repeat:no-repeat;image-rendering:pixelated;}}</style>")
+
+
+def sprite_html(pokemon_id: int, size: int, variant: str = "front", style: str = "", alt: str = "") -> str:
+    """One sprite at ``size`` px, cut out of the atlas when possible (needs ``atlas_css``)."""
+    index = load_index()
+    pos = index["sprites"].get(_key(pokemon_id, variant)) if index else None
+    if pos is None:
+        return (
+            f'<img src="{variant_url(pokemon_id, variant, size)}" width="{size}" height="{size}" '
+            f'alt="{alt}" loading="lazy" style="image-rendering:pixelated;{style}"/>'
+        )
+    scale = size / index["tile"]
+    return (
+        f'<div role="img" aria-label="{alt}" class="{CSS_CLASS}" style="width:{size}px;height:{size}px;'
+        f'background-position:-{pos[0] * scale:g}px -{pos[1] * scale:g}px;'
+        f'background-size:{index["width"] * scale:g}px {index["height"] * scale:g}px;{style}"></div>'
+    )
+
+
+if __name__ == "__main__":
+    from utils.pokemon_data import POKEMON_IDS
+
+    parser = argparse.ArgumentParser(description="Build the sprite atlas.")
+    parser.add_argument("--webp", action="store_true", help="write a lossless WebP atlas")
+    args = parser.parse_args()
+    sprites.prefetch([sprites.pokemon_path(pid) for pid in POKEMON_IDS])
+    index = build_atlas(POKEMON_IDS, fmt="webp" if args.webp else "png")
+    print(f"{len(index['sprites'])} sprites → {sprites.local_path(index['image'])}")
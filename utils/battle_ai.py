@@ -0,0 +1,142 @@
+"""
+"Moeilijk" enemy AI: a depth-limited expectimax search over the battle rules
+in ``utils.battle_engine``.
+
+The enemy maximises, the player is modelled as picking each move with equal
+chance, and every damage roll is a chance node. To keep the tree small each
+damage range is split into ``ROLL_BUCKETS`` equally likely buckets, each
+represented by its mean. Leaves are scored by the HP difference (as fractions
+of max HP); a finished battle scores +1 (enemy wins) or -1.
+
+Every searched state is stored in a bounded, process-wide transposition
+table keyed by the matchup's stats and (player_hp, enemy_hp, defending, turn,
+depth), so all sessions playing the same matchup share the work and most
+decisions after the first are plain lookups.
+"""
+import threading
+from collections import OrderedDict
+
+from utils.battle_engine import ATTACK, DEFEND, DEFEND_MULT, MOVES, SPECIAL, damage_range
+
+SEARCH_DEPTH = 2    # enemy moves to look ahead
+ROLL_BUCKETS = 2    # chance outcomes per damage roll
+ENEMY_MOVES = (SPECIAL, ATTACK, DEFEND)  # tie-break order
+
+
+class TranspositionTable:
+    """A thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 200_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+TABLE = TranspositionTable()
+
+
+def _buckets(lo: int, hi: int, k: int = ROLL_BUCKETS) -> list[tuple[int, float]]:
+    """Split the uniform roll lo..hi into at most ``k`` (damage, probability) outcomes."""
+    values = list(range(lo, hi + 1))
+    k = min(k, len(values))
+    size, extra = divmod(len(values), k)
+    out, start = [], 0
+    for i in range(k):
+        end = start + size + (i < extra)
+        chunk = values[start:end]
+        out.append((round(sum(chunk) / len(chunk)), len(chunk) / len(values)))
+        start = end
+    return out
+
+
+class _Search:
+    def __init__(self, player: dict, enemy: dict, table: TranspositionTable):
+        self.table = table
+        self.p_max, self.e_max = player["hp"], enemy["hp"]
+        self.matchup = tuple(player[s] for s in ("hp", "attack", "defense")) + \
+            tuple(enemy[s] for s in ("hp", "attack", "defense"))
+        self.player_rolls = {m: _buckets(*damage_range(player, enemy, m)) for m in (ATTACK, SPECIAL)}
+        self.player_rolls[DEFEND] = [(0, 1.0)]
+        # enemy hits on a player who is / is not defending
+        self.enemy_rolls = {}
+        for m in (ATTACK, SPECIAL):
+            rolls = _buckets(*damage_range(enemy, player, m))
+            self.enemy_rolls[m, False] = rolls
+            self.enemy_rolls[m, True] = [(max(1, int(d * DEFEND_MULT)), p) for d, p in rolls]
+
+    def enemy_node(self, p_hp: int, e_hp: int, defending: bool, depth: int) -> tuple[float, str]:
+        if depth == 0:
+            return e_hp / self.e_max - p_hp / self.p_max, ATTACK
+        key = (self.matchup, p_hp, e_hp, defending, "enemy", depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        best = None
+        for move in ENEMY_MOVES:
+            if move == DEFEND:
+                value = self.player_node(p_hp, e_hp, depth)
+            else:
+                value = 0.0
+                for dmg, prob in self.enemy_rolls[move, defending]:
+                    value += prob * (1.0 if p_hp - dmg <= 0 else self.player_node(p_hp - dmg, e_hp, depth))
+            if best is None or value > best[0]:
+                best = (value, move)
+        self.table.put(key, best)
+        return best
+
+    def player_node(self, p_hp: int, e_hp: int, depth: int) -> float:
+        key = (self.matchup, p_hp, e_hp, False, "player", depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        value = 0.0
+        for move in MOVES:
+            for dmg, prob in self.player_rolls[move]:
+                if e_hp - dmg <= 0:
+                    outcome = -1.0
+                else:
+                    outcome = self.enemy_node(p_hp, e_hp - dmg, move == DEFEND, depth - 1)[0]
+                value += prob * outcome / len(MOVES)
+        self.table.put(key, value)
+        return value
+
+
+def choose_enemy_move_hard(player: dict, enemy: dict, player_hp: int, enemy_hp: int,
+                           defending: bool, depth: int = SEARCH_DEPTH,
+                           table: TranspositionTable = TABLE) -> str:
+    """The enemy's best move by expectimax, given both Pokémon's stats and HP."""
+    return _Search(player, enemy, table).enemy_node(player_hp, enemy_hp, defending, depth)[1]
+
+
+def hard_policy(player: dict, enemy: dict, depth: int = SEARCH_DEPTH, table: TranspositionTable = TABLE):
+    """``choose_enemy_move_hard`` for one matchup, as ``move(player_hp, enemy_hp, defending)``
+    (for asking it about many states, e.g. in ``utils.battle_odds``)."""
+    search = _Search(player, enemy, table)
+    return lambda player_hp, enemy_hp, defending: search.enemy_node(player_hp, enemy_hp, defending, depth)[1]
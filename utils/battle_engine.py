@@ -0,0 +1,75 @@
+"""
+Battle rules, free of any Streamlit code.
+
+A battle is turn based and the player always moves first:
+  • aanval       damage in [base-5, base+10],  base = max(1, atk - def // 2)
+  • speciaal     damage in [base-5, base+15],  base = max(5, atk * 3 // 2 - def // 3)
+  • verdediging  no damage; the enemy's next hit is halved (at least 1)
+The enemy picks a random move, favouring "speciaal" below 30% HP.
+"""
+import random
+
+ATTACK = "aanval"
+SPECIAL = "speciaal"
+DEFEND = "verdediging"
+MOVES = (ATTACK, SPECIAL, DEFEND)
+
+DEFEND_MULT = 0.5
+LOW_HP_FRACTION = 0.3
+ENEMY_MOVES = [ATTACK, ATTACK, SPECIAL, DEFEND]
+ENEMY_MOVES_LOW_HP = [SPECIAL, SPECIAL, ATTACK]
+
+
+def damage_range(attacker: dict, defender: dict, move: str) -> tuple[int, int]:
+    """Inclusive (min, max) damage of ``move``; (0, 0) for verdediging."""
+    if move == ATTACK:
+        base = max(1, attacker["attack"] - defender["defense"] // 2)
+        return max(1, base - 5), base + 10
+    elif move == SPECIAL:
+        base = max(5, attacker["attack"] * 3 // 2 - defender["defense"] // 3)
+        return max(1, base - 5), base + 15
+    return 0, 0  # verdediging doet geen schade
+
+
+def calc_damage(attacker: dict, defender: dict, move: str, rng: random.Random = random) -> int:
+    lo, hi = damage_range(attacker, defender, move)
+    return rng.randint(lo, hi) if hi else 0
+
+
+def shielded(raw_damage: int, defending: bool) -> int:
+    """Damage that gets through when the target may be defending."""
+    return max(1, int(raw_damage * (DEFEND_MULT if defending else 1.0)))
+
+
+def choose_enemy_move(enemy_hp: int, enemy_maxhp: int, rng: random.Random = random) -> str:
+    """Enemy AI: random move, slightly smarter when low HP."""
+    if enemy_hp / enemy_maxhp < LOW_HP_FRACTION:
+        return rng.choice(ENEMY_MOVES_LOW_HP)
+    return rng.choice(ENEMY_MOVES)
+
+
+def play_battle(player: dict, enemy: dict, choose_player_move, rng: random.Random = random,
+                max_turns: int = 200, choose_enemy=None) -> bool:
+    """Play one battle headlessly; True if the player wins.
+
+    ``choose_player_move(player_hp, enemy_hp)`` returns one of ``MOVES``;
+    ``choose_enemy(player_hp, enemy_hp, defending)`` replaces the default
+    enemy AI. A battle still running after ``max_turns`` player turns counts
+    as lost.
+    """
+    player_hp, enemy_hp = player["hp"], enemy["hp"]
+    for _ in range(max_turns):
+        move = choose_player_move(player_hp, enemy_hp)
+        defending = move == DEFEND
+        enemy_hp -= calc_damage(player, enemy, move, rng)
+        if enemy_hp <= 0:
+            return True
+        if choose_enemy is None:
+            enemy_move = choose_enemy_move(enemy_hp, enemy["hp"], rng)
+        else:
+            enemy_move = choose_enemy(player_hp, enemy_hp, defending)
+        if enemy_move != DEFEND:
+            player_hp -= shielded(calc_damage(enemy, player, enemy_move, rng), defending)
+            if player_hp <= 0:
+                return False
+    return False
@@ -0,0 +1,207 @@
+"""
+Exact win chances for a matchup, by dynamic programming over HP states.
+
+Damage rolls are small uniform ranges and HP is at most 100, so a battle is a
+small Markov chain. ``odds_table`` solves it in one pass over the
+(player_hp, enemy_hp) grid, against the normal enemy AI of
+``utils.battle_engine`` or the "Moeilijk" one of ``utils.battle_ai``
+(``enemy_ai="hard"``: its move is a fixed function of the state, looked up
+for every state before the pass, in a transposition table of its own so the
+live AI's entries in ``utils.battle_ai.TABLE`` stay put):
+
+  V[p][e]            chance the player wins when it is the player's turn
+  W[defending][p][e] the same, but the enemy is about to move
+
+Every uniform roll is a window average over a row or column, read from
+running prefix sums, so each state costs O(1). The only cycle is (player
+defends, enemy defends), which leaves the state unchanged; it is solved in
+closed form: V = X / (1 - q). When both always defend there (q = 1) the battle
+never ends, which counts as not winning.
+
+Tables are built on one background thread and kept for the ``MAX_TABLES`` most
+recently used matchups. ``odds_table`` waits for its table, ``odds_table_nowait``
+returns None until it is ready, for pages that must not stall a rerun.
+
+The player either plays optimally ("optimal") or follows one of the fixed
+policies of the simulator, which makes this an exact oracle for
+``utils.battle_sim``:
+
+    python -m utils.battle_odds     # compare DP and simulator on a few matchups
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.battle_ai import TranspositionTable, hard_policy
+from utils.battle_engine import (ATTACK, DEFEND, DEFEND_MULT, ENEMY_MOVES, ENEMY_MOVES_LOW_HP,
+                                 LOW_HP_FRACTION, MOVES, SPECIAL, damage_range)
+
+POLICIES = ("optimal", "greedy", "random", ATTACK, SPECIAL)
+ENEMY_AIS = ("normal", "hard")
+MAX_TABLES = 128
+
+
+def _move_weights(moves: list[str]) -> dict[str, float]:
+    return {m: moves.count(m) / len(moves) for m in MOVES}
+
+
+def _shielded_rolls(lo: int, hi: int) -> list[tuple[int, float]]:
+    """(damage, probability) of a uniform lo..hi hit on a defending player."""
+    counts: dict[int, int] = {}
+    for d in range(lo, hi + 1):
+        shielded = max(1, int(d * DEFEND_MULT))
+        counts[shielded] = counts.get(shielded, 0) + 1
+    n = hi - lo + 1
+    return [(d, c / n) for d, c in counts.items()]
+
+
+class OddsTable:
+    def __init__(self, player: dict, enemy: dict, policy: str = "optimal", enemy_ai: str = "normal"):
+        P, E = player["hp"], enemy["hp"]
+        self.policy, self.enemy_ai = policy, enemy_ai
+        p_roll = {m: damage_range(player, enemy, m) for m in (ATTACK, SPECIAL)}
+        e_roll = {m: damage_range(enemy, player, m) for m in (ATTACK, SPECIAL)}
+        e_shield = {m: _shielded_rolls(*e_roll[m]) for m in (ATTACK, SPECIAL)}
+        # enemy move probabilities, by enemy HP
+        normal, low = _move_weights(ENEMY_MOVES), _move_weights(ENEMY_MOVES_LOW_HP)
+        q = [None] + [low if e / E < LOW_HP_FRACTION else normal for e in range(1, E + 1)]
+        if enemy_ai == "hard":
+            hard = hard_policy(player, enemy, table=TranspositionTable())
+            certain = {m: {n: float(n == m) for n in MOVES} for m in MOVES}
+        elif enemy_ai != "normal":
+            raise ValueError(f"Unknown enemy AI: {enemy_ai!r}")
+
+        if policy == "optimal":
+            pi = None
+        elif policy == "random":
+            pi = dict.fromkeys(MOVES, 1 / 3)
+        elif policy == "greedy":
+            best = SPECIAL if sum(p_roll[SPECIAL]) >= sum(p_roll[ATTACK]) else ATTACK
+            pi = {m: float(m == best) for m in MOVES}
+        elif policy in (ATTACK, SPECIAL):
+            pi = {m: float(m == policy) for m in MOVES}
+        else:
+            raise ValueError(f"Unknown policy: {policy!r}")
+
+        V = [[0.0] * (E + 1) for _ in range(P + 1)]   # row 0: player fainted
+        W = {False: [[0.0] * (E + 1) for _ in range(P + 1)], True: [[0.0] * (E + 1) for _ in range(P + 1)]}
+        best_move = [[None] * (E + 1) for _ in range(P + 1)]
+        cum_v = [[0.0] * (E + 1) for _ in range(P + 1)]  # cum_v[p][e] = sum of V[1..p][e]
+
+        def rows_avg(p: int, e: int, lo: int, hi: int) -> float:
+            """Mean of V[p - d][e] over d in lo..hi (fainted rows count as 0)."""
+            top, bottom = max(p - lo, 0), max(p - hi - 1, 0)
+            return (cum_v[top][e] - cum_v[bottom][e]) / (hi - lo + 1)
+
+        for p in range(1, P + 1):
+            cum_w = [0.0] * (E + 1)  # cum_w[e] = sum of W[False][p][1..e]
+            for e in range(1, E + 1):
+                # enemy move probabilities when the player did not / did defend
+                if enemy_ai == "hard":
+                    q_open, q_shield = certain[hard(p, e, False)], certain[hard(p, e, True)]
+                else:
+                    q_open = q_shield = q[e]
+                # enemy turn without its own "verdediging" (that term is V[p][e] itself)
+                x_open = sum(q_open[m] * rows_avg(p, e, *e_roll[m]) for m in (ATTACK, SPECIAL))
+                x_shield = sum(
+                    q_shield[m] * sum(prob * V[p - d][e] for d, prob in e_shield[m] if d < p)
+                    for m in (ATTACK, SPECIAL)
+                )
+                # player moves
+                values = {}
+                for m in (ATTACK, SPECIAL):
+                    lo, hi = p_roll[m]
+                    kills = max(0, hi - max(lo, e) + 1)
+                    top, bottom = max(e - lo, 0), max(e - hi - 1, 0)
+                    values[m] = (kills + cum_w[top] - cum_w[bottom]) / (hi - lo + 1)
+                stay = q_shield[DEFEND]  # both defend: back to this very state
+                if pi is None:
+                    values[DEFEND] = x_shield / (1 - stay) if stay < 1 else 0.0
+                    move = max(MOVES, key=values.__getitem__)
+                    v = values[move]
+                else:
+                    move = None
+                    a = pi[ATTACK] * values[ATTACK] + pi[SPECIAL] * values[SPECIAL] + pi[DEFEND] * x_shield
+                    loop = pi[DEFEND] * stay
+                    v = a / (1 - loop) if loop < 1 else 0.0
+                V[p][e] = v
+                best_move[p][e] = move
+                W[False][p][e] = x_open + q_open[DEFEND] * v
+                W[True][p][e] = x_shield + stay * v
+                cum_w[e] = cum_w[e - 1] + W[False][p][e]
+                cum_v[p][e] = cum_v[p - 1][e] + v
+
+        self.V, self.W, self._best = V, W, best_move
+
+    def win_chance(self, player_hp: int, enemy_hp: int) -> float:
+        """Chance the player wins from here, with the player to move."""
+        if enemy_hp <= 0:
+            return 1.0
+        if player_hp <= 0:
+            return 0.0
+        return self.V[player_hp][enemy_hp]
+
+    def win_chance_enemy_turn(self, player_hp: int, enemy_hp: int, defending: bool) -> float:
+        """Chance the player wins from here, with the enemy to move."""
+        if enemy_hp <= 0:
+            return 1.0
+        if player_hp <= 0:
+            return 0.0
+        return self.W[defending][player_hp][enemy_hp]
+
+    def best_move(self, player_hp: int, enemy_hp: int) -> str | None:
+        """The optimal player move (only for the "optimal" policy)."""
+        return self._best[player_hp][enemy_hp]
+
+
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="battle-odds")
+_tables: OrderedDict[tuple, Future] = OrderedDict()  # matchup -> its (future) table
+_lock = threading.Lock()
+
+
+def _table_future(player: dict, enemy: dict, policy: str, enemy_ai: str) -> Future:
+    key = (tuple(sorted(player.items())), tuple(sorted(enemy.items())), policy, enemy_ai)
+    with _lock:
+        future = _tables.get(key)
+        if future is None:
+            future = _tables[key] = _builder.submit(OddsTable, dict(player), dict(enemy), policy, enemy_ai)
+            if len(_tables) > MAX_TABLES:
+                _tables.popitem(last=False)
+        _tables.move_to_end(key)
+    return future
+
+
+def odds_table(player: dict, enemy: dict, policy: str = "optimal", enemy_ai: str = "normal") -> OddsTable:
+    """The (memoised) odds table of a matchup, built now if need be."""
+    return _table_future(player, enemy, policy, enemy_ai).result()
+
+
+def odds_table_nowait(player: dict, enemy: dict, policy: str = "optimal",
+                      enemy_ai: str = "normal") -> OddsTable | None:
+    """The odds table if it is ready; otherwise start building it and return None."""
+    future = _table_future(player, enemy, policy, enemy_ai)
+    return future.result() if future.done() else None
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+
+    from utils.battle_sim import simulate
+    from utils.species import species_table
+
+    table = species_table()
+    rng = np.random.default_rng(7)
+    n = 200_000
+    print(f"{'matchup':<12}{'policy':<10}{'DP':>8}{'sim':>8}{'±2σ':>8}{'DP ms':>8}")
+    for a, b in rng.choice(len(table), size=(4, 2), replace=False):
+        for policy in ("greedy", "random", ATTACK):
+            t0 = time.perf_counter()
+            exact = OddsTable(table.stats(table.ids[a]), table.stats(table.ids[b]), policy)
+            exact_p = exact.win_chance(table.hp[a], table.hp[b])
+            ms = (time.perf_counter() - t0) * 1e3
+            sim_p = simulate(np.full(n, a), np.full(n, b), policy, rng).mean()
+            sigma2 = 2 * (exact_p * (1 - exact_p) / n) ** 0.5
+            print(f"{f'{table.ids[a]}-{table.ids[b]}':<12}{policy:<10}{exact_p:>8.4f}{sim_p:>8.4f}"
+                  f"{sigma2:>8.4f}{ms:>8.1f}")
@@ -0,0 +1,167 @@
+"""
+Monte Carlo battle simulator: plays many battles of every matchup at once with
+NumPy, following the rules in ``utils.battle_engine``, and reports how often
+the player's Pokémon beats the enemy's.
+
+    python -m utils.battle_sim --battles 500 --workers 4 --out winrates.csv
+
+The result is a win-rate matrix indexed by species-table row:
+``rates[i, j]`` is the chance that ``ids[i]`` (player) beats ``ids[j]`` (enemy).
+Mirror matches are left as NaN, like the battle page never picks them.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.battle_engine import DEFEND_MULT, LOW_HP_FRACTION, MOVES
+
+_ATTACK, _SPECIAL, _DEFEND = range(3)
+POLICIES = ("greedy", "random", "aanval", "speciaal")
+
+
+def _stat_columns() -> dict[str, np.ndarray]:
+    from utils.species import species_table
+
+    table = species_table()
+    cols = {name: np.frombuffer(getattr(table, name), dtype=np.uint8).astype(np.int32)
+            for name in ("hp", "attack", "defense")}
+    cols["ids"] = np.frombuffer(table.ids, dtype=np.uint16)
+    return cols
+
+
+def _damage_bounds(atk: np.ndarray, dfn: np.ndarray) -> np.ndarray:
+    """(n, 3, 2) inclusive damage bounds per move, mirroring ``damage_range``."""
+    base_a = np.maximum(1, atk - dfn // 2)
+    base_s = np.maximum(5, atk * 3 // 2 - dfn // 3)
+    bounds = np.zeros((len(atk), 3, 2), dtype=np.int32)
+    bounds[:, _ATTACK] = np.stack([np.maximum(1, base_a - 5), base_a + 10], axis=1)
+    bounds[:, _SPECIAL] = np.stack([np.maximum(1, base_s - 5), base_s + 15], axis=1)
+    return bounds
+
+
+def _roll(rng: np.random.Generator, bounds: np.ndarray, move: np.ndarray) -> np.ndarray:
+    rows = np.arange(len(move))
+    lo, hi = bounds[rows, move, 0], bounds[rows, move, 1]
+    return np.where(move == _DEFEND, 0, rng.integers(lo, hi + 1))
+
+
+def simulate(player_rows: np.ndarray, enemy_rows: np.ndarray, policy: str = "greedy",
+             seed=None, max_turns: int = 200) -> np.ndarray:
+    """Play one battle per (player_rows[k], enemy_rows[k]) pair; returns a bool
+    array, True where the player won."""
+    stats = _stat_columns()
+    rng = np.random.default_rng(seed)
+    n = len(player_rows)
+    p_hp = stats["hp"][player_rows].copy()
+    e_max = stats["hp"][enemy_rows]
+    e_hp = e_max.copy()
+    p_dmg = _damage_bounds(stats["attack"][player_rows], stats["defense"][enemy_rows])
+    e_dmg = _damage_bounds(stats["attack"][enemy_rows], stats["defense"][player_rows])
+    if policy == "greedy":
+        # the move with the highest expected damage
+        greedy = np.where(p_dmg[:, _SPECIAL].sum(1) >= p_dmg[:, _ATTACK].sum(1), _SPECIAL, _ATTACK)
+
+    won = np.zeros(n, dtype=bool)
+    live = np.arange(n)
+    for _ in range(max_turns):
+        if not len(live):
+            break
+        # player turn
+        if policy == "greedy":
+            move = greedy[live]
+        elif policy == "random":
+            move = rng.integers(0, 3, len(live))
+        else:
+            move = np.full(len(live), MOVES.index(policy))
+        e_hp[live] -= _roll(rng, p_dmg[live], move)
+        beaten = e_hp[live] <= 0
+        won[live[beaten]] = True
+        defending = (move == _DEFEND)[~beaten]
+        live = live[~beaten]
+
+        # enemy turn: [aanval, aanval, speciaal, verdediging], or [speciaal, speciaal, aanval] when low
+        low = e_hp[live] / e_max[live] < LOW_HP_FRACTION
+        pick = rng.integers(0, 12, len(live))  # 12 = lcm(3, 4), one draw for both tables
+        e_move = np.where(
+            low,
+            np.where(pick % 3 < 2, _SPECIAL, _ATTACK),
+            np.choose(pick % 4, [_ATTACK, _ATTACK, _SPECIAL, _DEFEND]),
+        )
+        raw = _roll(rng, e_dmg[live], e_move)
+        hit = np.maximum(1, (raw * np.where(defending, DEFEND_MULT, 1.0)).astype(np.int32))
+        p_hp[live] -= np.where(e_move == _DEFEND, 0, hit)
+        live = live[p_hp[live] > 0]
+    return won
+
+
+def _simulate_rows(args) -> np.ndarray:
+    """Worker: win rates of the given player rows against every enemy row."""
+    rows, battles, policy, seed, chunk = args
+    n_species = len(_stat_columns()["hp"])
+    rates = np.zeros((len(rows), n_species))
+    rng = np.random.default_rng(seed)
+    enemies = np.arange(n_species)
+    per_row = n_species * battles
+    step = max(1, chunk // per_row)
+    for start in range(0, len(rows), step):
+        block = np.asarray(rows[start:start + step])
+        p = np.repeat(block, per_row)
+        e = np.tile(np.repeat(enemies, battles), len(block))
+        wins = simulate(p, e, policy, rng)
+        rates[start:start + len(block)] = wins.reshape(len(block), n_species, battles).mean(axis=2)
+    return rates
+
+
+def win_rate_matrix(battles: int = 200, policy: str = "greedy", workers: int = 1,
+                    seed: int | None = None, chunk: int = 1_000_000) -> np.ndarray:
+    """Win rates of every matchup over ``battles`` battles each, spread over
+    ``workers`` processes and at most ``chunk`` simultaneous battles per process."""
+    n_species = len(_stat_columns()["hp"])
+    seeds = np.random.SeedSequence(seed).spawn(max(1, workers))
+    row_blocks = np.array_split(np.arange(n_species), max(1, workers))
+    jobs = [(block, battles, policy, s, chunk) for block, s in zip(row_blocks, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_rows, jobs))
+    else:
+        parts = [_simulate_rows(job) for job in jobs]
+    rates = np.vstack(parts)
+    np.fill_diagonal(rates, np.nan)
+    return rates
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate every battle matchup and report win rates.")
+    parser.add_argument("--battles", type=int, default=200, help="battles per matchup")
+    parser.add_argument("--policy", choices=POLICIES, default="greedy", help="how the player picks moves")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", help="write the matrix as CSV (rows: player id, columns: enemy id)")
+    args = parser.parse_args(argv)
+
+    ids = _stat_columns()["ids"]
+    t0 = time.perf_counter()
+    rates = win_rate_matrix(args.battles, args.policy, args.workers, args.seed)
+    elapsed = time.perf_counter() - t0
+    total = len(ids) * (len(ids) - 1) * args.battles
+    print(f"{total:,} battles in {elapsed:.1f}s ({total / elapsed:,.0f}/s), policy={args.policy}")
+    print(f"overall player win rate: {np.nanmean(rates):.1%}")
+
+    from utils.pokemon_data import POKEMON
+
+    strength = np.nanmean(rates, axis=1) - np.nanmean(rates, axis=0)  # as player minus as enemy
+    order = np.argsort(strength)
+    print("strongest: " + ", ".join(f"{POKEMON[ids[i]]} ({strength[i]:+.2f})" for i in order[::-1][:5]))
+    print("weakest:   " + ", ".join(f"{POKEMON[ids[i]]} ({strength[i]:+.2f})" for i in order[:5]))
+    if args.out:
+        header = "player\\enemy," + ",".join(str(i) for i in ids)
+        body = np.column_stack([ids, rates])
+        np.savetxt(args.out, body, delimiter=",", header=header, comments="", fmt=["%d"] + ["%.4f"] * len(ids))
+        print(f"matrix written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
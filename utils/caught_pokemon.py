@@ -1,40 +1,143 @@
 """
-Persistent caught-Pokémon storage.
-Data is saved as JSON: { "<pokemon_id>": <catch_count>, ... }
+Persistent caught-Pokémon storage, one set of counts per player profile.
+
+The actual storage is a pluggable backend from ``utils.caught_store`` (SQLite
+by default, the JSON journal as a fallback — see ``POKEDEX_STORE``).
+
+``load_caught`` is served from a process-wide cache of read-only views that
+is invalidated by the backend's version token and by a local counter that
+``mark_caught``/``reset_caught`` bump, so a rerun that changed nothing costs
+one cheap version check instead of a full load.
+
+Optionally, catches can be buffered in memory and flushed in batches
+(``enable_write_behind``), trading the last few catches on a hard crash for
+fewer disk writes. A timer flushes a batch that is still waiting after
+``max_delay`` seconds, so the last catches of a session do not sit in memory
+until the process exits.
 """
-import json
-import os
+import atexit
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+from typing import Mapping
+
+from utils.caught_store import DEFAULT_PROFILE, JsonStore, open_store
+from utils.metrics import timed
+
+_lock = threading.RLock()
+_store = None
+_pending: list[tuple[str, int]] = []  # (profile, pokemon_id)
+_pending_since = 0.0
+_batch_size = 0  # 0 = write-behind disabled, every catch goes straight to the store
+_max_delay = 0.0
+_timer: threading.Timer | None = None  # flushes the pending batch after _max_delay
+_local_version = 0  # bumped by every mark/reset in this process
+_cache: dict[str, tuple[tuple, Mapping[int, int]]] = {}  # profile -> (version key, view)
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        try:
+            _store = open_store()
+        except sqlite3.Error:
+            _store = JsonStore()
+    return _store
+
+
+def set_store(store) -> None:
+    """Swap the storage backend (flushes buffered catches to the old one first)."""
+    global _store
+    with _lock:
+        flush()
+        _store = store
+        _cache.clear()
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit/miss counters of the ``load_caught`` cache."""
+    return {"hits": _cache_hits, "misses": _cache_misses}
+
 
-_DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "caught.json")
+def flush() -> None:
+    """Write any buffered catches to the store."""
+    global _pending
+    with _lock:
+        if not _pending:
+            return
+        batch, _pending = _pending, []
+        by_profile: dict[str, list[int]] = {}
+        for profile, pid in batch:
+            by_profile.setdefault(profile, []).append(pid)
+        for profile, ids in by_profile.items():
+            _get_store().add(profile, ids)
 
 
-def _load() -> dict[int, int]:
-    try:
-        with open(_DATA_FILE, "r") as f:
-            raw = json.load(f)
-        return {int(k): v for k, v in raw.items()}
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+def enable_write_behind(batch_size: int = 16, max_delay: float = 2.0) -> None:
+    """Buffer catches in memory and flush them every ``batch_size`` catches,
+    or ``max_delay`` seconds after the first catch of a batch. Pass ``batch_size=0`` to
+    write every catch straight through again."""
+    global _batch_size, _max_delay
+    with _lock:
+        _batch_size = batch_size
+        _max_delay = max_delay
+        if batch_size <= 0:
+            flush()
 
 
-def _save(data: dict[int, int]) -> None:
-    os.makedirs(os.path.dirname(_DATA_FILE), exist_ok=True)
-    with open(_DATA_FILE, "w") as f:
-        json.dump({str(k): v for k, v in data.items()}, f, indent=2)
+atexit.register(flush)
 
 
-def load_caught() -> dict[int, int]:
-    """Return {pokemon_id: times_caught}."""
-    return _load()
+@timed
+def load_caught(profile: str = DEFAULT_PROFILE) -> Mapping[int, int]:
+    """Return a read-only {pokemon_id: times_caught} view."""
+    global _cache_hits, _cache_misses
+    store = _get_store()
+    key = (_local_version, store.version(profile))
+    cached = _cache.get(profile)
+    if cached is not None and cached[0] == key:
+        _cache_hits += 1
+        return cached[1]
+    _cache_misses += 1
+    data = store.load(profile)
+    with _lock:
+        for p, pid in _pending:
+            if p == profile:
+                data[pid] = data.get(pid, 0) + 1
+    view = MappingProxyType(data)
+    _cache[profile] = (key, view)
+    return view
 
 
-def mark_caught(pokemon_id: int) -> None:
+@timed
+def mark_caught(pokemon_id: int, profile: str = DEFAULT_PROFILE) -> None:
     """Increment the catch count for a Pokémon."""
-    data = _load()
-    data[pokemon_id] = data.get(pokemon_id, 0) + 1
-    _save(data)
+    global _pending_since, _local_version, _timer
+    if _batch_size <= 0:
+        _get_store().add(profile, [pokemon_id])
+        with _lock:
+            _local_version += 1
+        return
+    with _lock:
+        _local_version += 1
+        if not _pending:
+            _pending_since = time.monotonic()
+            if _timer is None or not _timer.is_alive():
+                _timer = threading.Timer(_max_delay, flush)
+                _timer.daemon = True
+                _timer.start()
+        _pending.append((profile, pokemon_id))
+        if len(_pending) >= _batch_size or time.monotonic() - _pending_since >= _max_delay:
+            flush()
 
 
-def reset_caught() -> None:
+def reset_caught(profile: str = DEFAULT_PROFILE) -> None:
     """Clear all caught data."""
-    _save({})
+    global _pending, _local_version
+    with _lock:
+        _pending = [(p, pid) for p, pid in _pending if p != profile]
+        _get_store().reset(profile)
+        _local_version += 1
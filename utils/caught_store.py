@@ -0,0 +1,264 @@
+"""
+Storage backends for the caught-Pokémon counts.
+
+Every backend keeps separate counts per player profile and implements:
+  • load(profile)          -> {pokemon_id: times_caught}
+  • add(profile, ids)      increment the count of every id in ``ids``
+  • reset(profile)         forget everything for that profile
+  • version(profile)       cheap token that changes whenever the counts do
+
+``SqliteStore`` is the default: one WAL-mode database shared by all sessions,
+with an increment-on-conflict upsert so concurrent catches never get lost.
+``JsonStore`` is the original file format (snapshot + append-only journal) and
+remains available as a fallback.
+"""
+import json
+import os
+import sqlite3
+import threading
+from urllib.parse import quote
+
+from utils.db import ConnectionPool
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+DEFAULT_PROFILE = "default"
+
+
+# ── JSON snapshot + journal ────────────────────────────────────────────────────
+
+class JsonStore:
+    """
+    Per profile, data lives in two files under ``data_dir``:
+      • caught.json     snapshot: {"generation": <n>, "caught": {"<pokemon_id>": <catch_count>, ...}}
+      • caught.<n>.log  append-only journal, one "<pokemon_id>\\n" line per catch
+    (other profiles use ``caught@<profile>.json`` / ``caught@<profile>.<n>.log``).
+
+    A catch only appends to the journal of the current generation, so it costs
+    O(1) instead of rewriting the whole Pokédex. Once the journal grows past
+    ``compact_bytes`` it is folded into a new snapshot (generation n+1, written
+    via an atomic rename) and the old journal is removed. A crash mid-write
+    leaves at most one torn journal line, which is ignored on replay.
+
+    Appends from several processes are safe, compaction is only serialised
+    within one process — use ``SqliteStore`` for a shared server.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, compact_bytes: int = 4096):
+        self.data_dir = data_dir
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._generations: dict[str, tuple[tuple[int, int], int]] = {}  # profile -> (snapshot mtime/size, generation)
+
+    def _stem(self, profile: str) -> str:
+        if profile == DEFAULT_PROFILE:
+            return os.path.join(self.data_dir, "caught")
+        return os.path.join(self.data_dir, f"caught@{quote(profile, safe='')}")
+
+    def snapshot_path(self, profile: str = DEFAULT_PROFILE) -> str:
+        return f"{self._stem(profile)}.json"
+
+    def journal_path(self, profile: str, generation: int) -> str:
+        return f"{self._stem(profile)}.{generation}.log"
+
+    def _read_snapshot(self, profile: str) -> tuple[int, dict[int, int]]:
+        try:
+            with open(self.snapshot_path(profile), "r") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0, {}
+        if "caught" not in raw:
+            # Legacy flat format: { "<pokemon_id>": <catch_count>, ... }
+            return 0, {int(k): v for k, v in raw.items()}
+        return raw.get("generation", 0), {int(k): v for k, v in raw["caught"].items()}
+
+    def _replay(self, profile: str, generation: int, data: dict[int, int]) -> None:
+        try:
+            with open(self.journal_path(profile, generation), "rb") as f:
+                lines = f.read().split(b"\n")
+        except FileNotFoundError:
+            return
+        # The last element is b"" for a clean journal, or a torn line after a crash.
+        for line in lines[:-1]:
+            try:
+                pid = int(line)
+            except ValueError:
+                continue
+            data[pid] = data.get(pid, 0) + 1
+
+    def _write_snapshot(self, profile: str, generation: int, data: dict[int, int]) -> None:
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = self.snapshot_path(profile)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"generation": generation, "caught": {str(k): v for k, v in data.items()}}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _current_generation(self, profile: str) -> int:
+        """Generation of the snapshot on disk, re-read only when the file changed."""
+        try:
+            st = os.stat(self.snapshot_path(profile))
+        except FileNotFoundError:
+            return 0
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._generations.get(profile)
+        if cached is None or cached[0] != key:
+            cached = self._generations[profile] = (key, self._read_snapshot(profile)[0])
+        return cached[1]
+
+    def _start_generation(self, profile: str, generation: int, data: dict[int, int]) -> None:
+        self._write_snapshot(profile, generation + 1, data)
+        try:
+            os.remove(self.journal_path(profile, generation))
+        except FileNotFoundError:
+            pass
+
+    def version(self, profile: str = DEFAULT_PROFILE) -> tuple:
+        stamps = []
+        generation = self._current_generation(profile)
+        for path in (self.snapshot_path(profile), self.journal_path(profile, generation)):
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def load(self, profile: str = DEFAULT_PROFILE) -> dict[int, int]:
+        with self._lock:
+            generation, data = self._read_snapshot(profile)
+            self._replay(profile, generation, data)
+            return data
+
+    def add(self, profile: str, pokemon_ids: list[int]) -> None:
+        with self._lock:
+            generation = self._current_generation(profile)
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(self.journal_path(profile, generation), "a+b") as f:
+                prefix = b""
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        prefix = b"#\n"  # poison a torn line left by a crash so replay skips it
+                f.write(prefix + b"".join(b"%d\n" % pid for pid in pokemon_ids))
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            if size > self.compact_bytes:
+                self._start_generation(profile, generation, self.load(profile))
+
+    def reset(self, profile: str = DEFAULT_PROFILE) -> None:
+        with self._lock:
+            self._start_generation(profile, self._current_generation(profile), {})
+
+
+# ── SQLite ─────────────────────────────────────────────────────────────────────
+
+class SqliteStore:
+    """
+    All profiles in one ``caught.db`` (WAL mode, so readers never block the
+    writer). On first open the legacy JSON data of the default profile is
+    imported once.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS caught (
+            profile    TEXT    NOT NULL,
+            pokemon_id INTEGER NOT NULL,
+            count      INTEGER NOT NULL,
+            PRIMARY KEY (profile, pokemon_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS versions (
+            profile TEXT    PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, pool_size: int = 4):
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        self.pool = ConnectionPool(os.path.join(data_dir, "caught.db"), pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(self._SCHEMA)
+        self.migrate_from(JsonStore(data_dir))
+
+    def migrate_from(self, legacy: JsonStore, profile: str = DEFAULT_PROFILE) -> bool:
+        """Import ``legacy``'s counts for ``profile`` exactly once. Returns True if it ran."""
+        key = f"migrated_json:{profile}"
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                    conn.execute("ROLLBACK")
+                    return False
+                conn.executemany(
+                    "INSERT INTO caught (profile, pokemon_id, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT (profile, pokemon_id) DO UPDATE SET count = count + excluded.count",
+                    [(profile, pid, cnt) for pid, cnt in legacy.load(profile).items()],
+                )
+                self._bump(conn, profile)
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, '1')", (key,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, profile: str) -> None:
+        conn.execute(
+            "INSERT INTO versions (profile, version) VALUES (?, 1) "
+            "ON CONFLICT (profile) DO UPDATE SET version = version + 1",
+            (profile,),
+        )
+
+    def version(self, profile: str = DEFAULT_PROFILE) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT version FROM versions WHERE profile = ?", (profile,)).fetchone()
+            return row[0] if row else 0
+
+    def load(self, profile: str = DEFAULT_PROFILE) -> dict[int, int]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT pokemon_id, count FROM caught WHERE profile = ?", (profile,))
+            return dict(rows.fetchall())
+
+    def add(self, profile: str, pokemon_ids: list[int]) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO caught (profile, pokemon_id, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT (profile, pokemon_id) DO UPDATE SET count = count + 1",
+                    [(profile, pid) for pid in pokemon_ids],
+                )
+                self._bump(conn, profile)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def reset(self, profile: str = DEFAULT_PROFILE) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM caught WHERE profile = ?", (profile,))
+                self._bump(conn, profile)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+
+def open_store(kind: str | None = None, data_dir: str = DATA_DIR):
+    """Create the backend named by ``kind`` or ``$POKEDEX_STORE`` ("sqlite" or "json")."""
+    kind = (kind or os.environ.get("POKEDEX_STORE", "sqlite")).lower()
+    if kind == "json":
+        return JsonStore(data_dir)
+    if kind == "sqlite":
+        return SqliteStore(data_dir)
+    raise ValueError(f"Unknown caught store: {kind!r}")
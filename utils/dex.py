@@ -0,0 +1,69 @@
+"""
+The Pokédex page's list of caught Pokémon, kept out of the page script so it
+can be timed on its own (``pytest benchmarks/``).
+
+Cards come from the HTML cache (``utils.html_cache``) once their sprite is in the atlas; until
+then the sprite URL may still change (see ``utils.sprites.resolve``), so those
+are built every time.
+"""
+from typing import Mapping
+
+from utils.atlas import atlas_version, sprite_html
+from utils.html_cache import HTML_CACHE
+from utils.name_index import get_name_index
+from utils.pokemon_data import POKEMON
+
+SORT_OPTIONS = ["Pokédex #", "Naam", "Meest gevangen"]
+
+
+def display_list(caught: Mapping[int, int], search: str = "",
+                 sort_by: str = SORT_OPTIONS[0]) -> list[tuple[int, str, int]]:
+    """(pokemon_id, name, times caught) of the caught Pokémon matching
+    ``search``, in the order picked with ``sort_by``."""
+    display = [(pid, POKEMON[pid], caught[pid]) for pid in caught if pid in POKEMON]
+
+    if search:
+        matching = set(get_name_index().search(search))
+        display = [(pid, name, cnt) for pid, name, cnt in display if pid in matching]
+
+    if sort_by == "Naam":
+        display.sort(key=lambda x: x[1])
+    elif sort_by == "Meest gevangen":
+        display.sort(key=lambda x: x[2], reverse=True)
+    else:
+        display.sort(key=lambda x: x[0])
+    return display
+
+
+def caught_card(pid: int, name: str, cnt: int) -> str:
+    """One card of the caught grid."""
+    version = atlas_version(pid)
+    if version is None:
+        return _caught_card(pid, name, cnt)
+    return HTML_CACHE.get(("dex_card", pid, name, cnt, version), lambda: _caught_card(pid, name, cnt))
+
+
+def missing_card(pid: int) -> str:
+    """One silhouette card of the not-yet-caught grid."""
+    version = atlas_version(pid, "silhouette")
+    if version is None:
+        return _missing_card(pid)
+    return HTML_CACHE.get(("dex_missing_card", pid, version), lambda: _missing_card(pid))
+
+
+def _caught_card(pid: int, name: str, cnt: int) -> str:
+    return (
+        f"<div style='text-align:center;'>{sprite_html(pid, 90, alt=name)}"
+        f"<p style='text-align:center;font-size:0.75rem;margin:0;'>"
+        f"<strong>#{pid}</strong><br>{name}</p>"
+        f"<p style='text-align:center;font-size:0.7rem;color:#aaa;margin:0;'>"
+        f"x{cnt} gevangen</p></div>"
+    )
+
+
+def _missing_card(pid: int) -> str:
+    return (
+        f"<div style='text-align:center;'>"
+        f"{sprite_html(pid, 80, 'silhouette', 'filter:brightness(0);opacity:0.4;')}"
+        f"<p style='font-size:0.7rem;color:#555;margin:0;'>???</p></div>"
+    )
@@ -0,0 +1,28 @@
+"""
+Card grids rendered as one HTML block per page instead of one Streamlit
+element per card, so the number of elements per rerun stays constant no
+matter how many Pokémon are listed.
+"""
+import streamlit as st
+
+
+def card_grid_html(cards: list[str], cols: int = 6) -> str:
+    """Lay out pre-rendered card HTML snippets in a CSS grid."""
+    return (
+        f"<div style='display:grid;grid-template-columns:repeat({cols},minmax(0,1fr));"
+        f"gap:0.75rem;align-items:start;'>{''.join(cards)}</div>"
+    )
+
+
+def paginate(items: list, page_size: int, key: str) -> list:
+    """Return the slice of ``items`` on the selected page, with a page picker
+    shown only when there is more than one page."""
+    n_pages = max(1, -(-len(items) // page_size))
+    if n_pages == 1:
+        return items
+    page = st.session_state.get(key, 1)
+    if page > n_pages:
+        st.session_state[key] = page = n_pages  # the list shrank (search/filter)
+    page = st.number_input(f"Pagina (van {n_pages})", min_value=1, max_value=n_pages, step=1, key=key)
+    start = (page - 1) * page_size
+    return items[start: start + page_size]
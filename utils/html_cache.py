@@ -0,0 +1,66 @@
+"""
+A process-wide, bounded LRU cache of rendered HTML.
+
+Worth it for markup that is costly to build and repeats across reruns, like
+the Pokédex cards; a formatter of a microsecond or so is cheaper to call than
+to look up. ``HTML_CACHE.get(key, build)`` returns the string built earlier for
+``key`` and only calls ``build`` on a miss. A key is a tuple whose first item
+names the kind of markup (``("dex_card", 25, ...)``); hits and misses are
+counted per kind. Only the ``maxsize`` most recently used strings are kept.
+
+A key must hold every input the markup depends on. Markup that points to a
+sprite whose URL can still change (hot-linked until it has been downloaded)
+is left uncached.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+MAX_ENTRIES = 8192
+
+
+class HtmlCache:
+    def __init__(self, maxsize: int = MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._items: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts: dict[str, list[int]] = {}  # kind -> [hits, misses]
+
+    def get(self, key: tuple, build: Callable[[], str]) -> str:
+        counts = self._counts.get(key[0]) or self._counts.setdefault(key[0], [0, 0])
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+                counts[0] += 1
+                return html
+            counts[1] += 1
+        html = build()
+        with self._lock:
+            self._items[key] = html
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        """Size, and hits/misses/hit rate overall and per kind."""
+        with self._lock:
+            kinds = {kind: {"hits": h, "misses": m, "hit_rate": h / (h + m) if h + m else 0.0}
+                     for kind, (h, m) in self._counts.items()}
+            hits = sum(k["hits"] for k in kinds.values())
+            misses = sum(k["misses"] for k in kinds.values())
+            return {
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "kinds": kinds,
+            }
+
+
+HTML_CACHE = HtmlCache()
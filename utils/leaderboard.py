@@ -0,0 +1,146 @@
+"""
+Persistent leaderboards, one per game and board variant, in ``leaderboard.db``
+next to the caught store.
+
+A board is ``"<game>"`` or ``"<game>:<variant>"`` (e.g. ``"memory:Normaal (4×3)"``);
+``GAMES`` says whether a higher or a lower score wins. Every row stores its
+``rank`` (the score, negated when higher is better), so all boards sort
+ascending on one index ``(board, rank, at)``, earlier results first on a tie.
+
+Each board keeps only its best ``K`` results: ``record`` compares the new
+result with the K-th place, inserts it if it beats it and drops whatever fell
+off. A board therefore never holds more than K rows, and recording a result or
+reading a top list is an index lookup plus at most K rows, however many games
+have been played.
+
+A result can carry an ``entry`` id to improve in place instead of adding a row:
+a streak is recorded under one entry at every step, so it shows up once, with
+its best length, even if the session ends mid-streak.
+"""
+import os
+import sqlite3
+import time
+import uuid
+
+from utils.caught_store import DATA_DIR
+from utils.db import ConnectionPool
+
+K = 10
+GAMES = {  # game -> (label, higher score wins)
+    "raden":    ("🎮 Wie is dat Pokémon? — langste reeks", True),
+    "gevecht":  ("⚔️ Gevecht — overwinningen op rij", True),
+    "parcours": ("🏃 Parcours — minste stappen", False),
+    "memory":   ("🧠 Memory — minste pogingen", False),
+}
+
+
+def board_name(game: str, variant: str | None = None) -> str:
+    return f"{game}:{variant}" if variant else game
+
+
+def new_entry() -> str:
+    """A fresh id for a result that will be improved in place (a streak)."""
+    return uuid.uuid4().hex
+
+
+class Leaderboard:
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            board   TEXT    NOT NULL,
+            entry   TEXT    NOT NULL,
+            rank    INTEGER NOT NULL,
+            score   INTEGER NOT NULL,
+            profile TEXT    NOT NULL,
+            at      REAL    NOT NULL,
+            PRIMARY KEY (board, entry)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (board, rank, at);
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, k: int = K, pool_size: int = 4):
+        os.makedirs(data_dir, exist_ok=True)
+        self.k = k
+        self.pool = ConnectionPool(os.path.join(data_dir, "leaderboard.db"), pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(self._SCHEMA)
+
+    def record(self, game: str, variant: str | None, profile: str, score: int,
+               entry: str | None = None) -> int | None:
+        """Enter ``score``; its place (1-based) on the board, or None if it did not make the top K."""
+        board = board_name(game, variant)
+        rank = -score if GAMES[game][1] else score
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = None
+                if entry is not None:
+                    old = conn.execute("SELECT rank, at FROM scores WHERE board = ? AND entry = ?",
+                                       (board, entry)).fetchone()
+                if old is not None:
+                    if rank >= old[0]:  # no improvement
+                        conn.execute("ROLLBACK")
+                        return self._place(conn, board, *old)
+                    conn.execute("UPDATE scores SET rank = ?, score = ?, profile = ?, at = ? "
+                                 "WHERE board = ? AND entry = ?", (rank, score, profile, now, board, entry))
+                else:
+                    last = conn.execute("SELECT rank FROM scores WHERE board = ? ORDER BY rank, at "
+                                        "LIMIT 1 OFFSET ?", (board, self.k - 1)).fetchone()
+                    if last is not None and rank >= last[0]:  # ties go to the earlier result
+                        conn.execute("ROLLBACK")
+                        return None
+                    conn.execute("INSERT INTO scores (board, entry, rank, score, profile, at) "
+                                 "VALUES (?, ?, ?, ?, ?, ?)", (board, entry or new_entry(), rank, score, profile, now))
+                    conn.execute("DELETE FROM scores WHERE board = ? AND entry IN ("
+                                 "SELECT entry FROM scores WHERE board = ? ORDER BY rank, at LIMIT -1 OFFSET ?)",
+                                 (board, board, self.k))
+                place = self._place(conn, board, rank, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return place
+
+    @staticmethod
+    def _place(conn: sqlite3.Connection, board: str, rank: int, at: float) -> int:
+        better = conn.execute("SELECT COUNT(*) FROM scores WHERE board = ? AND (rank < ? OR (rank = ? AND at < ?))",
+                              (board, rank, rank, at)).fetchone()[0]
+        return better + 1
+
+    def top(self, game: str, variant: str | None = None) -> list[tuple[int, str, float]]:
+        """(score, profile, timestamp) of the best results, best first."""
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT score, profile, at FROM scores WHERE board = ? ORDER BY rank, at LIMIT ?",
+                                (board_name(game, variant), self.k)).fetchall()
+
+    def variants(self, game: str) -> list[str | None]:
+        """The variants of ``game`` that have results (None for the plain board)."""
+        with self.pool.connection() as conn:
+            boards = [b for (b,) in conn.execute(
+                "SELECT DISTINCT board FROM scores WHERE board = ? OR board BETWEEN ? AND ?",
+                (game, f"{game}:", f"{game}:\U0010ffff"))]
+        return [b.partition(":")[2] or None for b in boards]
+
+    def reset(self, game: str | None = None) -> None:
+        with self.pool.connection() as conn:
+            if game is None:
+                conn.execute("DELETE FROM scores")
+            else:
+                conn.execute("DELETE FROM scores WHERE board = ? OR board BETWEEN ? AND ?",
+                             (game, f"{game}:", f"{game}:\U0010ffff"))
+
+
+_board: Leaderboard | None = None
+
+
+def get_leaderboard() -> Leaderboard:
+    """The process-wide leaderboard, in ``DATA_DIR`` unless ``set_leaderboard`` chose another."""
+    global _board
+    if _board is None:
+        _board = Leaderboard()
+    return _board
+
+
+def set_leaderboard(board: Leaderboard) -> None:
+    global _board
+    _board = board
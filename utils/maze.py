@@ -0,0 +1,327 @@
+"""
+Maze generation on a flat ``bytearray`` grid.
+
+A maze of ``rows × cols`` (both odd) is stored row-major, ``grid[r * cols + c]``,
+one byte per square holding one of the ``CELL_*`` codes. Rooms sit on even
+coordinates; the squares between them are walls or carved passages. Every
+generator below is iterative and produces a perfect maze (exactly one path
+between any two rooms), so sizes of 1001×1001 and up are fine:
+
+  • backtracker  randomised depth-first search (long, winding corridors)
+  • kruskal      random spanning tree via union-find (many short dead ends)
+  • wilson       loop-erased random walks (uniformly random spanning tree)
+  • eller        row by row, memory proportional to the width only
+
+``distance_field`` runs one reverse Dijkstra from the finish, after which the
+best next move, the remaining cost and the optimal route are lookups.
+``build_maze`` puts it all together into a playable maze for the Parcours page,
+and ``build_valid_maze`` keeps building until the life cost of the best route
+(``life_cost``) falls in the difficulty's band.
+"""
+import heapq
+import random
+from array import array
+from collections import deque
+
+CELL_WALL = 0
+CELL_FREE = 1
+CELL_HAZARD = 2
+CELL_BONUS = 3
+CELL_START = 4
+CELL_FINISH = 5
+
+HAZARDS = ["🔥", "💧", "🪨", "⚡", "🌵"]
+MAX_LIVES = 5
+# chance a free square becomes a hazard / a bonus, and the accepted range of
+# hazards the player cannot avoid on the way to the finish
+DIFFICULTIES = {
+    "makkelijk": {"hazard": 0.04, "bonus": 0.12, "band": (0, 1)},
+    "normaal":   {"hazard": 0.08, "bonus": 0.10, "band": (1, 3)},
+    "moeilijk":  {"hazard": 0.14, "bonus": 0.06, "band": (3, MAX_LIVES - 1)},
+}
+
+LIFE_COST = 10          # steps a life is worth when planning a route
+UNREACHABLE = 0xFFFFFFFF
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+# cost of stepping onto a square, in half steps and indexed by CELL_* code: a hazard
+# adds LIFE_COST steps, a bonus halves its step (weights stay positive, so no cycles)
+STEP_COST = bytes([0, 2, 2 + 2 * LIFE_COST, 1, 2, 2])
+
+
+def _rooms(rows: int, cols: int) -> tuple[int, int]:
+    if rows % 2 == 0 or cols % 2 == 0 or rows < 1 or cols < 1:
+        raise ValueError(f"Maze size must be odd, got {rows}×{cols}")
+    return (rows + 1) // 2, (cols + 1) // 2
+
+
+def _carve(grid: bytearray, cols: int, a: tuple[int, int], b: tuple[int, int]) -> None:
+    """Open rooms ``a`` and ``b`` (room coordinates) and the wall between them."""
+    (r1, c1), (r2, c2) = a, b
+    grid[2 * r1 * cols + 2 * c1] = CELL_FREE
+    grid[2 * r2 * cols + 2 * c2] = CELL_FREE
+    grid[(r1 + r2) * cols + (c1 + c2)] = CELL_FREE
+
+
+def backtracker(rows: int, cols: int, rng: random.Random = random) -> bytearray:
+    R, C = _rooms(rows, cols)
+    grid = bytearray(rows * cols)
+    seen = bytearray(R * C)
+    seen[0] = 1
+    grid[0] = CELL_FREE
+    stack = [(0, 0)]
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                   if 0 <= r + dr < R and 0 <= c + dc < C and not seen[(r + dr) * C + c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nxt = rng.choice(options)
+        seen[nxt[0] * C + nxt[1]] = 1
+        _carve(grid, cols, (r, c), nxt)
+        stack.append(nxt)
+    return grid
+
+
+def _find(parent: list[int], x: int) -> int:
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def kruskal(rows: int, cols: int, rng: random.Random = random) -> bytearray:
+    R, C = _rooms(rows, cols)
+    grid = bytearray(rows * cols)
+    grid[0] = CELL_FREE  # a 1×1 maze has no edges
+    parent = list(range(R * C))
+    edges = [(r, c, 0) for r in range(R) for c in range(C - 1)] + \
+            [(r, c, 1) for r in range(R - 1) for c in range(C)]
+    rng.shuffle(edges)
+    for r, c, down in edges:
+        a, b = r * C + c, (r + down) * C + c + (not down)
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra != rb:
+            parent[ra] = rb
+            _carve(grid, cols, (r, c), (r + down, c + (not down)))
+    return grid
+
+
+def wilson(rows: int, cols: int, rng: random.Random = random) -> bytearray:
+    R, C = _rooms(rows, cols)
+    grid = bytearray(rows * cols)
+    in_tree = bytearray(R * C)
+    in_tree[rng.randrange(R * C)] = 1
+    grid[0] = CELL_FREE
+    step = [0] * (R * C)  # last direction taken out of each room during the current walk
+    moves = ((0, 1), (0, -1), (1, 0), (-1, 0))
+    order = list(range(R * C))
+    rng.shuffle(order)
+    for start in order:
+        if in_tree[start]:
+            continue
+        # random walk until the tree is hit; overwriting ``step`` erases loops
+        cell = start
+        while not in_tree[cell]:
+            r, c = divmod(cell, C)
+            while True:
+                k = rng.randrange(4)
+                nr, nc = r + moves[k][0], c + moves[k][1]
+                if 0 <= nr < R and 0 <= nc < C:
+                    break
+            step[cell] = k
+            cell = nr * C + nc
+        # add the loop-erased path to the tree
+        cell = start
+        while not in_tree[cell]:
+            r, c = divmod(cell, C)
+            dr, dc = moves[step[cell]]
+            _carve(grid, cols, (r, c), (r + dr, c + dc))
+            in_tree[cell] = 1
+            cell = (r + dr) * C + c + dc
+    return grid
+
+
+def eller(rows: int, cols: int, rng: random.Random = random) -> bytearray:
+    R, C = _rooms(rows, cols)
+    grid = bytearray(rows * cols)
+    grid[0] = CELL_FREE
+    parent: list[int] = []  # union-find over set labels
+
+    def new_set() -> int:
+        parent.append(len(parent))
+        return len(parent) - 1
+
+    row_sets = [new_set() for _ in range(C)]
+    for r in range(R):
+        last = r == R - 1
+        # join neighbours in different sets (always, on the last row)
+        for c in range(C - 1):
+            a, b = _find(parent, row_sets[c]), _find(parent, row_sets[c + 1])
+            if a != b and (last or rng.random() < 0.5):
+                parent[b] = a
+                _carve(grid, cols, (r, c), (r, c + 1))
+        if last:
+            break
+        # every set continues downwards at least once
+        members: dict[int, list[int]] = {}
+        for c in range(C):
+            members.setdefault(_find(parent, row_sets[c]), []).append(c)
+        next_sets = [-1] * C
+        for label, cs in members.items():
+            down = [c for c in cs if rng.random() < 0.5] or [rng.choice(cs)]
+            for c in down:
+                _carve(grid, cols, (r, c), (r + 1, c))
+                next_sets[c] = label
+        row_sets = [s if s >= 0 else new_set() for s in next_sets]
+    return grid
+
+
+ALGORITHMS = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "eller": eller,
+}
+
+
+def generate(rows: int, cols: int, algorithm: str = "backtracker", rng: random.Random = random) -> bytearray:
+    """A perfect maze of ``rows × cols`` squares (``CELL_WALL`` / ``CELL_FREE``)."""
+    return ALGORITHMS[algorithm](rows, cols, rng)
+
+
+# ── distance field ────────────────────────────────────────────────────────────
+
+def distance_field(grid: bytearray, rows: int, cols: int, target: tuple[int, int]) -> array:
+    """Cheapest cost from every square to ``target`` (``UNREACHABLE`` for walls
+    and cut-off squares), with ``STEP_COST`` per square entered."""
+    dist = array("I", [UNREACHABLE]) * (rows * cols)
+    start = target[0] * cols + target[1]
+    dist[start] = 0
+    heap = [(0, start)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d != dist[u]:
+            continue
+        r, c = divmod(u, cols)
+        step = d + STEP_COST[grid[u]]  # moving from a neighbour onto ``u``
+        for dr, dc in MOVES:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                v = nr * cols + nc
+                if grid[v] != CELL_WALL and step < dist[v]:
+                    dist[v] = step
+                    heapq.heappush(heap, (step, v))
+    return dist
+
+
+def next_step(dist: array, grid: bytearray, rows: int, cols: int,
+              pos: tuple[int, int]) -> tuple[int, int] | None:
+    """The move ``(dr, dc)`` towards the target along a cheapest route, or None
+    when ``pos`` is the target or cannot reach it."""
+    r, c = pos
+    here = dist[r * cols + c]
+    if here == 0 or here == UNREACHABLE:
+        return None
+    for dr, dc in MOVES:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols:
+            v = nr * cols + nc
+            if dist[v] != UNREACHABLE and dist[v] + STEP_COST[grid[v]] == here:
+                return dr, dc
+    return None
+
+
+def route(dist: array, grid: bytearray, rows: int, cols: int, pos: tuple[int, int]) -> list[tuple[int, int]]:
+    """The squares of a cheapest route from ``pos`` to the target, both included
+    (just ``[pos]`` when there is none)."""
+    path = [pos]
+    while (move := next_step(dist, grid, rows, cols, path[-1])) is not None:
+        path.append((path[-1][0] + move[0], path[-1][1] + move[1]))
+    return path
+
+
+# ── playable mazes ────────────────────────────────────────────────────────────
+
+def life_cost(grid: bytearray, rows: int, cols: int) -> int:
+    """The fewest hazards on any way from the start to the finish (0-1 BFS);
+    ``UNREACHABLE`` if there is none."""
+    finish = rows * cols - 1
+    cost = array("I", [UNREACHABLE]) * (rows * cols)
+    cost[0] = 0
+    queue = deque([0])
+    while queue:
+        u = queue.popleft()
+        if u == finish:
+            return cost[u]
+        r, c = divmod(u, cols)
+        for dr, dc in MOVES:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                v = nr * cols + nc
+                hazard = grid[v] == CELL_HAZARD
+                if grid[v] != CELL_WALL and cost[u] + hazard < cost[v]:
+                    cost[v] = cost[u] + hazard
+                    if hazard:
+                        queue.append(v)
+                    else:
+                        queue.appendleft(v)
+    return UNREACHABLE
+
+
+def build_maze(rows: int, cols: int, algorithm: str = "backtracker", difficulty: str = "normaal",
+               rng: random.Random = random) -> dict:
+    """A maze with hazards, bonuses, start and finish, plus its distance field.
+
+    Returns ``grid`` (mutable, consumed during play), ``plan`` (the squares as
+    generated), ``hazards`` ({(r, c): emoji}), ``dist``, ``par`` (steps on the
+    best route from the start) and ``life_cost``. The maze is not validated;
+    see ``build_valid_maze``.
+    """
+    level = DIFFICULTIES[difficulty]
+    grid = generate(rows, cols, algorithm, rng)
+    finish = (rows - 1) * cols + cols - 1
+    goal = (rows - 1, cols - 1)
+
+    # Squares on the way to the finish get hazards at a rate that aims for the
+    # middle of the band whatever the route length; elsewhere the fixed rate.
+    path = route(distance_field(grid, rows, cols, goal), grid, rows, cols, (0, 0))[1:-1]
+    on_path = {r * cols + c for r, c in path}
+    lo, hi = level["band"]
+    path_prob = min(1.0, (lo + hi) / 2 / len(path)) if path else 0.0
+
+    # hazards and bonuses on free squares, never on the start & finish corners
+    hazards: dict[tuple[int, int], str] = {}
+    for i in range(1, finish):
+        if grid[i] == CELL_FREE:
+            roll = rng.random()
+            hazard_prob = path_prob if i in on_path else level["hazard"]
+            if roll < hazard_prob:
+                grid[i] = CELL_HAZARD
+                hazards[divmod(i, cols)] = rng.choice(HAZARDS)
+            elif roll < hazard_prob + level["bonus"]:
+                grid[i] = CELL_BONUS
+    grid[0] = CELL_START
+    grid[finish] = CELL_FINISH
+
+    plan = bytes(grid)
+    dist = distance_field(grid, rows, cols, goal)
+    par = len(route(dist, plan, rows, cols, (0, 0))) - 1
+    return {"grid": grid, "plan": plan, "hazards": hazards, "dist": dist, "par": par,
+            "life_cost": life_cost(grid, rows, cols)}
+
+
+def in_band(maze: dict, difficulty: str) -> bool:
+    lo, hi = DIFFICULTIES[difficulty]["band"]
+    return lo <= maze["life_cost"] <= hi
+
+
+def build_valid_maze(rows: int, cols: int, algorithm: str = "backtracker", difficulty: str = "normaal",
+                     rng: random.Random = random, max_tries: int = 1000) -> tuple[dict, int]:
+    """The first ``build_maze`` candidate within the difficulty band, and the
+    number of candidates it took (the last candidate if none passed)."""
+    for tries in range(1, max_tries + 1):
+        maze = build_maze(rows, cols, algorithm, difficulty, rng)
+        if in_band(maze, difficulty):
+            break
+    return maze, tries
@@ -0,0 +1,205 @@
+"""
+A process-wide pool of ready-made mazes, so starting a new maze never waits for
+generation.
+
+Mazes are kept per key ``(rows, cols, algorithm, difficulty)``. A background
+thread tops every key up to ``capacity`` whenever it falls below ``watermark``;
+``take`` pops a maze, or if the key has run dry (a miss) builds a single
+candidate on the spot, which may fall outside its difficulty band, rather than
+keep the page waiting for a validated one. Only the ``max_keys`` most recently used keys are kept warm.
+
+Every maze is validated against its difficulty band (``utils.maze.in_band``),
+so refilling is rejection sampling: the thread hands batches of candidates to
+a ``ProcessPoolExecutor`` (forkserver processes: forking the threaded server
+could leave a child stuck on a lock some other thread held) and keeps the
+ones that pass, which keeps the work
+off the process serving the UI. Per key the pool counts candidates and
+accepted mazes, for acceptance rates and throughput. If a refill round fails,
+the thread reports the error and stops; the next ``warm``/``take`` starts a
+new one.
+"""
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.maze import build_maze, in_band
+
+WATERMARK = 2
+CAPACITY = 4
+MAX_KEYS = 8
+WORKERS = min(4, os.cpu_count() or 1)
+BATCH_CELLS = 40_000   # squares generated per batch, so a batch takes roughly the same time at any size
+MAX_BATCH = 32
+
+
+def candidate_batch(key: tuple, n: int, seed: int) -> tuple[list[dict], int]:
+    """Build ``n`` candidates for ``key``; the ones within the band, and ``n``."""
+    rows, cols, algorithm, difficulty = key
+    rng = random.Random(seed)
+    accepted = []
+    for _ in range(n):
+        maze = build_maze(rows, cols, algorithm, difficulty, rng)
+        if in_band(maze, difficulty):
+            accepted.append(maze)
+    return accepted, n
+
+
+@contextmanager
+def _no_main_script():
+    """Hide ``__main__`` while worker processes start. Streamlit runs each page
+    as ``__main__``, and a spawned/forkserver child re-runs whatever script
+    ``__main__`` came from before it unpickles its first task."""
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+def batch_size(key: tuple) -> int:
+    return max(1, min(MAX_BATCH, BATCH_CELLS // (key[0] * key[1])))
+
+
+class MazePool:
+    def __init__(self, watermark: int = WATERMARK, capacity: int = CAPACITY, max_keys: int = MAX_KEYS,
+                 workers: int = WORKERS):
+        self.watermark, self.capacity, self.max_keys = watermark, capacity, max_keys
+        self.workers = workers  # 0: build in the refill thread itself
+        self._executor: ProcessPoolExecutor | None = None
+        self._ready: OrderedDict[tuple, deque] = OrderedDict()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._counts: dict[tuple, list[int]] = {}  # key -> [candidates, accepted]
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.errors = 0
+        self.build_seconds = 0.0
+
+    def _touch(self, key: tuple) -> deque:
+        """The queue of ``key``, marked most recently used (caller holds the lock)."""
+        queue = self._ready.get(key)
+        if queue is None:
+            queue = self._ready[key] = deque()
+            while len(self._ready) > self.max_keys:
+                self._ready.popitem(last=False)
+        self._ready.move_to_end(key)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refill_forever, name="maze-pool", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+        return queue
+
+    def warm(self, key: tuple) -> None:
+        """Start filling ``key`` in the background."""
+        with self._cond:
+            self._touch(key)
+
+    def take(self, key: tuple) -> dict:
+        """A validated maze for ``key``; nobody else will get the same one."""
+        with self._cond:
+            queue = self._touch(key)
+            maze = queue.popleft() if queue else None
+            if maze is not None:
+                self.hits += 1
+                return maze
+            self.misses += 1
+        t0 = time.perf_counter()
+        maze = build_maze(*key)  # one candidate; the refill thread was woken for the rest
+        self._record(key, 1, int(in_band(maze, key[3])), time.perf_counter() - t0)
+        return maze
+
+    def _record(self, key: tuple, candidates: int, accepted: int, seconds: float) -> None:
+        with self._cond:
+            counts = self._counts.setdefault(key, [0, 0])
+            counts[0] += candidates
+            counts[1] += accepted
+            self.build_seconds += seconds
+
+    def _batches(self, key: tuple) -> list[tuple[list[dict], int]]:
+        """One round of candidate batches, spread over the worker processes
+        (none once the executor has shut down at interpreter exit)."""
+        n = batch_size(key)
+        if self.workers > 0:
+            try:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context("forkserver"))
+                with _no_main_script():  # submit starts the workers it needs
+                    futures = [self._executor.submit(candidate_batch, key, n, random.getrandbits(64))
+                               for _ in range(self.workers)]
+                return [f.result() for f in futures]
+            except (OSError, BrokenProcessPool):
+                self.workers = 0  # no subprocesses here; build in this thread from now on
+            except RuntimeError:
+                return []
+        return [candidate_batch(key, n, random.getrandbits(64))]
+
+    def _low_key(self) -> tuple | None:
+        """The most recently used key below the watermark (caller holds the lock)."""
+        for key in reversed(self._ready):
+            if len(self._ready[key]) < self.watermark:
+                return key
+        return None
+
+    def _refill_forever(self) -> None:
+        try:
+            self._refill()
+        except BaseException:
+            with self._cond:
+                self._thread = None  # the next warm()/take() starts a new refill thread
+                self.errors += 1
+            raise  # printed by threading.excepthook
+
+    def _refill(self) -> None:
+        while True:
+            with self._cond:
+                while (key := self._low_key()) is None:
+                    self._cond.wait()
+                self.refills += 1
+            while True:
+                t0 = time.perf_counter()
+                results = self._batches(key)
+                if not results:
+                    return
+                self._record(key, sum(n for _, n in results), sum(len(a) for a, _ in results),
+                             time.perf_counter() - t0)
+                with self._cond:
+                    queue = self._ready.get(key)
+                    if queue is None:  # evicted meanwhile
+                        break
+                    for accepted, _ in results:
+                        queue.extend(accepted[:self.capacity - len(queue)])
+                    if len(queue) >= self.capacity:
+                        break
+
+    def stats(self) -> dict:
+        with self._cond:
+            taken = self.hits + self.misses
+            candidates = sum(c for c, _ in self._counts.values())
+            accepted = sum(a for _, a in self._counts.values())
+            return {
+                "depth": {key: len(q) for key, q in self._ready.items()},
+                "acceptance": {key: a / c for key, (c, a) in self._counts.items() if c},
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / taken if taken else 0.0,
+                "refills": self.refills,
+                "errors": self.errors,
+                "candidates": candidates,
+                "accepted": accepted,
+                "candidates_per_s": candidates / self.build_seconds if self.build_seconds else 0.0,
+                "avg_build_ms": self.build_seconds / accepted * 1e3 if accepted else 0.0,
+            }
+
+
+POOL = MazePool()
@@ -0,0 +1,63 @@
+"""
+Viewport ("camera") rendering of a maze as an HTML table.
+
+Only a window of ``height × width`` squares around the player is drawn, so a
+rerun costs the same on a 9×9 and a 201×201 maze. The rendered ``<tr>`` of
+every row in the window is cached together with the column it starts at; a
+move only invalidates the rows it changed (old and new position), and the
+camera only scrolls once the player comes within ``margin`` squares of an
+edge, so most reruns reuse all but one or two rows.
+"""
+from typing import Callable
+
+VIEW_SIZE = 11
+MARGIN = 3
+
+
+class MazeView:
+    def __init__(self, rows: int, cols: int, height: int = VIEW_SIZE, width: int = VIEW_SIZE,
+                 margin: int = MARGIN):
+        self.rows, self.cols = rows, cols
+        self.height, self.width = min(height, rows), min(width, cols)
+        self.margin = margin
+        self.top = self.left = 0
+        self._rows: dict[int, tuple[int, str]] = {}  # row -> (left, "<tr>…</tr>")
+        self.rebuilt = 0  # rows rendered by the last ``html`` call
+
+    @property
+    def clipped(self) -> bool:
+        """True when the maze is larger than the window."""
+        return (self.height, self.width) != (self.rows, self.cols)
+
+    def invalidate(self, *cells: tuple[int, int]) -> None:
+        for r, _ in cells:
+            self._rows.pop(r, None)
+
+    def follow(self, pos: tuple[int, int]) -> None:
+        """Scroll so ``pos`` stays at least ``margin`` squares from the edges."""
+        self.top = self._scroll(self.top, pos[0], self.height, self.rows)
+        self.left = self._scroll(self.left, pos[1], self.width, self.cols)
+
+    def _scroll(self, start: int, p: int, size: int, total: int) -> int:
+        margin = min(self.margin, (size - 1) // 2)
+        if p < start + margin:
+            start = p - margin
+        elif p > start + size - 1 - margin:
+            start = p - size + 1 + margin
+        return max(0, min(start, total - size))
+
+    def html(self, render_cell: Callable[[int, int], str]) -> str:
+        """The ``<tr>`` rows of the window; ``render_cell(r, c)`` returns one ``<td>``."""
+        left, right = self.left, self.left + self.width
+        out, self.rebuilt = [], 0
+        for r in range(self.top, self.top + self.height):
+            cached = self._rows.get(r)
+            if cached is None or cached[0] != left:
+                cached = (left, "<tr>" + "".join(render_cell(r, c) for c in range(left, right)) + "</tr>")
+                self._rows[r] = cached
+                self.rebuilt += 1
+            out.append(cached[1])
+        # forget rows that scrolled out of view
+        if len(self._rows) > 2 * self.height:
+            self._rows = {r: v for r, v in self._rows.items() if self.top <= r < self.top + self.height}
+        return "".join(out)
@@ -0,0 +1,149 @@
+"""
+Memory rules and computer players, free of any Streamlit code.
+
+A game is a shuffled deck of pairs; a turn flips two face-down cards and
+counts as one attempt. A matched pair stays face up and the same player moves
+again; otherwise both cards go back face down and the turn passes. Every flip
+is public, so bots ``observe`` the human's cards as well as their own:
+
+  • random   flips any face-down cards, remembers nothing
+  • perfect  remembers every card it has seen
+  • limited  remembers the last ``capacity`` cards it saw and forgets each
+             memory with chance ``forget`` per turn
+"""
+import random
+from array import array
+
+DOWN, MATCHED = 0, 2
+
+
+class MemoryGame:
+    def __init__(self, card_ids: list[int]):
+        self.cards = array("H", card_ids)        # pokemon_id per card
+        self.state = bytearray(len(card_ids))    # DOWN / MATCHED per card
+        self._down = list(range(len(card_ids)))  # face-down cards, in no particular order
+        self._slot = list(range(len(card_ids)))  # position of each card in ``_down``
+        self.attempts = 0
+        self.pairs_found = 0
+        self.total_pairs = len(card_ids) // 2
+
+    @classmethod
+    def deal(cls, pairs: int, pokemon_ids: list[int], rng: random.Random = random) -> "MemoryGame":
+        card_ids = rng.sample(pokemon_ids, pairs) * 2
+        rng.shuffle(card_ids)
+        return cls(card_ids)
+
+    @property
+    def over(self) -> bool:
+        return self.pairs_found >= self.total_pairs
+
+    def face_down(self) -> list[int]:
+        """The face-down cards (a live view: do not modify)."""
+        return self._down
+
+    def _remove(self, idx: int) -> None:
+        """Drop ``idx`` from ``_down`` in O(1) by moving the last entry into its slot."""
+        last = self._down.pop()
+        if last != idx:
+            self._down[self._slot[idx]] = last
+            self._slot[last] = self._slot[idx]
+
+    def turn(self, first: int, second: int) -> bool:
+        """Flip two face-down cards; True (and both stay up) if they match."""
+        if first == second or self.state[first] != DOWN or self.state[second] != DOWN:
+            raise ValueError(f"Cards {first} and {second} cannot be flipped together")
+        self.attempts += 1
+        if self.cards[first] != self.cards[second]:
+            return False
+        self.state[first] = self.state[second] = MATCHED
+        self._remove(first)
+        self._remove(second)
+        self.pairs_found += 1
+        return True
+
+
+# ── bots ──────────────────────────────────────────────────────────────────────
+
+class RandomBot:
+    def __init__(self, rng: random.Random = random):
+        self.rng = rng
+
+    def observe(self, idx: int, pokemon_id: int) -> None:
+        pass
+
+    def pick(self, game: MemoryGame, first: int | None = None) -> int:
+        while (idx := self.rng.choice(game.face_down())) == first:
+            pass
+        return idx
+
+
+class RecallBot(RandomBot):
+    """Plays known pairs first and otherwise explores unseen cards."""
+
+    def __init__(self, rng: random.Random = random, capacity: int | None = None, forget: float = 0.0):
+        super().__init__(rng)
+        self.capacity, self.forget = capacity, forget
+        self.memory: dict[int, int] = {}  # card index -> pokemon_id, oldest first
+
+    def observe(self, idx: int, pokemon_id: int) -> None:
+        self.memory.pop(idx, None)
+        self.memory[idx] = pokemon_id
+        if self.capacity is not None and len(self.memory) > self.capacity:
+            del self.memory[next(iter(self.memory))]
+
+    def pick(self, game: MemoryGame, first: int | None = None) -> int:
+        # matched cards no longer take up room in memory
+        known = self.memory = {i: pid for i, pid in self.memory.items() if game.state[i] == DOWN}
+        if first is None:
+            if self.forget:
+                for i in [i for i in known if self.rng.random() < self.forget]:
+                    del known[i]
+            seen: dict[int, int] = {}
+            for i, pid in known.items():
+                if pid in seen:
+                    return seen[pid]  # a known pair
+                seen[pid] = i
+        else:
+            target = game.cards[first]
+            for i, pid in known.items():
+                if pid == target and i != first:
+                    return i
+        unseen = [i for i in game.face_down() if i not in known and i != first]
+        return self.rng.choice(unseen) if unseen else super().pick(game, first)
+
+
+BOTS = {
+    "random":  lambda rng: RandomBot(rng),
+    "limited": lambda rng: RecallBot(rng, capacity=6, forget=0.1),
+    "perfect": lambda rng: RecallBot(rng),
+}
+
+
+def make_bot(name: str, rng: random.Random = random):
+    return BOTS[name](rng)
+
+
+def bot_turn(game: MemoryGame, bot, watchers=()) -> list[tuple[int, int, bool]]:
+    """Let ``bot`` play until it misses or the game ends; the (first, second,
+    matched) of every attempt. ``watchers`` are other bots that see the cards."""
+    moves = []
+    while not game.over:
+        first = bot.pick(game)
+        for b in (bot, *watchers):
+            b.observe(first, game.cards[first])
+        second = bot.pick(game, first)
+        for b in (bot, *watchers):
+            b.observe(second, game.cards[second])
+        matched = game.turn(first, second)
+        moves.append((first, second, matched))
+        if not matched:
+            break
+    return moves
+
+
+def play_solo(pairs: int, bot, rng: random.Random = random) -> int:
+    """Attempts ``bot`` needs to clear a fresh board of ``pairs`` pairs."""
+    game = MemoryGame.deal(pairs, range(pairs), rng)
+    while not game.over:
+        bot_turn(game, bot)
+    return game.attempts
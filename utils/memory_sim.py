@@ -0,0 +1,73 @@
+"""
+Memory strategy simulator: lets every bot of ``utils.memory_engine`` clear
+thousands of boards per size, spread over processes, and reports how many
+attempts (``m_attempts`` on the Memory page) and what accuracy (pairs found /
+attempts) each needs.
+
+    python -m utils.memory_sim --games 5000 --workers 4
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.memory_engine import BOTS, make_bot, play_solo
+
+BOARD_PAIRS = [4, 6, 8, 24, 50, 117]  # the Memory page presets
+
+
+def _play_chunk(args) -> list[int]:
+    """Worker: attempts of ``games`` solo games of one bot on one board size."""
+    bot_name, pairs, games, seed = args
+    rng = random.Random(seed)
+    return [play_solo(pairs, make_bot(bot_name, rng), rng) for _ in range(games)]
+
+
+def attempt_samples(bot_name: str, pairs: int, games: int, workers: int = 1,
+                    seed: int | None = None) -> list[int]:
+    seeds = random.Random(seed)
+    n = max(1, workers)
+    jobs = [(bot_name, pairs, games // n + (k < games % n), seeds.getrandbits(64)) for k in range(n)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_play_chunk, jobs))
+    else:
+        parts = [_play_chunk(job) for job in jobs]
+    return [a for part in parts for a in part]
+
+
+def summary(pairs: int, attempts: list[int]) -> dict:
+    p10, p50, p90 = (statistics.quantiles(attempts, n=10)[i] for i in (0, 4, 8))
+    return {
+        "mean": statistics.fmean(attempts),
+        "p10": p10, "p50": p50, "p90": p90,
+        "min": min(attempts), "max": max(attempts),
+        "accuracy": statistics.fmean(pairs / a for a in attempts),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate Memory bots and report attempt distributions.")
+    parser.add_argument("--games", type=int, default=2000, help="games per bot and board size")
+    parser.add_argument("--bots", nargs="+", choices=list(BOTS), default=list(BOTS))
+    parser.add_argument("--pairs", nargs="+", type=int, default=BOARD_PAIRS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'pairs':>5}  {'bot':<8}{'mean':>8}{'p10':>8}{'p50':>8}{'p90':>8}{'min':>6}{'max':>6}{'accuracy':>10}")
+    t0 = time.perf_counter()
+    for pairs in args.pairs:
+        for bot in args.bots:
+            s = summary(pairs, attempt_samples(bot, pairs, args.games, args.workers, args.seed))
+            print(f"{pairs:>5}  {bot:<8}{s['mean']:>8.1f}{s['p10']:>8.1f}{s['p50']:>8.1f}{s['p90']:>8.1f}"
+                  f"{s['min']:>6}{s['max']:>6}{s['accuracy']:>10.0%}")
+    elapsed = time.perf_counter() - t0
+    total = args.games * len(args.bots) * len(args.pairs)
+    print(f"\n{total:,} games in {elapsed:.1f}s ({total / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Opt-in per-rerun instrumentation. Every page calls ``instrument(page)`` right
+after ``st.set_page_config``; with ``$POKEDEX_METRICS`` unset that is a no-op
+and ``timed`` hands back the undecorated function, so nothing is measured.
+
+Set it to ``jsonl``, ``prometheus`` or both (``jsonl,prometheus``) and each
+script run records
+
+  • seconds              wall time of the run
+  • elements             Streamlit elements sent to the browser
+  • html_bytes           HTML pushed through ``st.markdown(unsafe_allow_html=True)``
+  • payload_bytes        size of all messages sent
+  • mark_caught_seconds  time spent in ``mark_caught`` (likewise ``load_caught``)
+
+The counts come from the run's ``ScriptRunContext.enqueue``, which every
+element the page sends goes through; a run lasts until its last message and is
+recorded when its session starts the next run (so a session's very last run is
+not). The last ``WINDOW`` runs per page are kept for rolling percentiles; ``jsonl`` appends every run to
+``$POKEDEX_METRICS_FILE`` (``data/metrics.jsonl``), ``prometheus`` serves the
+percentiles as summaries on ``http://127.0.0.1:$POKEDEX_METRICS_PORT/metrics``
+(port 9464), together with the hit and miss counts of the HTML cache
+(``utils.html_cache``).
+
+    POKEDEX_METRICS=prometheus streamlit run 10_🎮_Pokemon.py
+    curl -s http://127.0.0.1:9464/metrics
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.caught_store import DATA_DIR
+from utils.html_cache import HTML_CACHE
+
+SINKS = set(os.environ.get("POKEDEX_METRICS", "").lower().replace(",", " ").split())
+ENABLED = bool(SINKS)
+METRICS_FILE = os.environ.get("POKEDEX_METRICS_FILE", os.path.join(DATA_DIR, "metrics.jsonl"))
+METRICS_PORT = int(os.environ.get("POKEDEX_METRICS_PORT", "9464"))
+WINDOW = 500
+QUANTILES = (0.5, 0.9, 0.99)
+FIELDS = ("seconds", "elements", "html_bytes", "payload_bytes", "mark_caught_seconds", "load_caught_seconds")
+
+_local = threading.local()  # .run: the run being recorded on this script thread
+_lock = threading.Lock()
+_recent: dict[str, deque] = {}                   # page -> last WINDOW runs
+_totals: dict[tuple[str, str], list[float]] = {}  # (page, field) -> [sum, count]
+_open: dict[str, dict] = {}                       # session id -> its last run, not recorded yet
+_server = None  # the /metrics server, False when its port was taken
+
+
+def timed(fn):
+    """Add the time spent in ``fn`` to the current run as ``<name>_seconds``."""
+    if not ENABLED:
+        return fn
+    field = f"{fn.__name__}_seconds"
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        run = getattr(_local, "run", None)
+        if run is None:
+            return fn(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            run[field] += time.perf_counter() - t0
+    return wrapper
+
+
+def instrument(page: str) -> None:
+    """Record this script run of ``page`` (a no-op unless ``$POKEDEX_METRICS`` is set)."""
+    if not ENABLED:
+        return
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    if getattr(ctx.enqueue, "__name__", "") != "counting_enqueue":
+        enqueue = ctx.enqueue
+
+        def counting_enqueue(msg) -> None:
+            _count(msg)
+            enqueue(msg)
+        ctx.enqueue = counting_enqueue
+    now = time.perf_counter()
+    run = dict.fromkeys(FIELDS, 0)
+    run.update(page=page, start=now, end=now)
+    with _lock:
+        previous = _open.pop(ctx.session_id, None)
+        _open[ctx.session_id] = _local.run = run
+    if previous is not None:
+        _finish(previous)
+    if "prometheus" in SINKS:
+        _serve()
+
+
+def _count(msg) -> None:
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    run["end"] = time.perf_counter()
+    run["payload_bytes"] += msg.ByteSize()
+    kind = msg.WhichOneof("type")
+    if kind == "ref_hash":  # a message the browser already has cached
+        run["elements"] += 1
+    elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+        run["elements"] += 1
+        element = msg.delta.new_element
+        if element.WhichOneof("type") == "markdown" and element.markdown.allow_html:
+            run["html_bytes"] += len(element.markdown.body.encode())
+
+
+def _finish(run: dict) -> None:
+    run["seconds"] = run.pop("end") - run.pop("start")
+    record(run)
+
+
+def record(run: dict) -> None:
+    """Add one finished run to the rolling window (and the JSONL file)."""
+    page = run["page"]
+    with _lock:
+        _recent.setdefault(page, deque(maxlen=WINDOW)).append(run)
+        for field in FIELDS:
+            total = _totals.setdefault((page, field), [0.0, 0])
+            total[0] += run[field]
+            total[1] += 1
+        if "jsonl" in SINKS:
+            os.makedirs(os.path.dirname(METRICS_FILE) or ".", exist_ok=True)
+            with open(METRICS_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": round(time.time(), 3), **run}) + "\n")
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile of sorted ``values``."""
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+def snapshot() -> dict[str, dict[str, dict[float, float]]]:
+    """{page: {field: {quantile: value}}} over the last ``WINDOW`` runs."""
+    with _lock:
+        recent = {page: list(runs) for page, runs in _recent.items()}
+    return {
+        page: {field: {q: _quantile(values, q) for q in QUANTILES}
+               for field in FIELDS
+               for values in [sorted(run[field] for run in runs)]}
+        for page, runs in recent.items()
+    }
+
+
+def prometheus_text() -> str:
+    """The rolling percentiles as Prometheus summaries (sum/count since start)."""
+    snap = snapshot()
+    with _lock:
+        totals = dict(_totals)
+    lines = []
+    for field in FIELDS:
+        name = f"pokedex_run_{field}"
+        lines += [f"# HELP {name} Per script run: {field.replace('_', ' ')}.", f"# TYPE {name} summary"]
+        for page, fields in snap.items():
+            for q, value in fields[field].items():
+                lines.append(f'{name}{{page="{page}",quantile="{q}"}} {value:g}')
+            total, count = totals[(page, field)]
+            lines.append(f'{name}_sum{{page="{page}"}} {total:g}')
+            lines.append(f'{name}_count{{page="{page}"}} {count}')
+    cache = HTML_CACHE.stats()
+    for outcome in ("hits", "misses"):
+        name = f"pokedex_html_cache_{outcome}_total"
+        lines += [f"# HELP {name} HTML cache {outcome}, per kind of markup.", f"# TYPE {name} counter"]
+        for kind, counts in cache["kinds"].items():
+            lines.append(f'{name}{{kind="{kind}"}} {counts[outcome]}')
+    lines += ["# HELP pokedex_html_cache_size HTML strings held.", "# TYPE pokedex_html_cache_size gauge",
+              f"pokedex_html_cache_size {cache['size']}"]
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve() -> None:
+    """Start the /metrics endpoint once per process."""
+    global _server
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), _Handler)
+        except OSError:  # port taken, e.g. by another app process: keep recording
+            _server = False
+            return
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
@@ -0,0 +1,118 @@
+"""
+Name lookup for Pokémon: substring search for the Pokédex and forgiving
+matching of typed answers.
+
+Names are normalised (accents, case and punctuation dropped, so "Mr. Mime",
+"mr mime" and "MrMime" are all "mrmime") and indexed by their 1-, 2- and
+3-character substrings. A substring query intersects the postings of its
+trigrams instead of scanning every name; near-miss spellings are found via
+shared padded trigrams and ranked by edit distance.
+"""
+import unicodedata
+from functools import lru_cache
+
+
+def normalize(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(ch for ch in decomposed if ch.isalnum()).lower()
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning ``limit + 1``) once it must exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def max_typos(query: str) -> int:
+    """How many edits a typed answer of this length may be off by."""
+    return 0 if len(query) < 4 else 1 if len(query) < 7 else 2
+
+
+class NameIndex:
+    def __init__(self, names: dict[int, str]):
+        self.names = names
+        self._norm = {pid: normalize(name) for pid, name in names.items()}
+        self._exact = {norm: pid for pid, norm in self._norm.items()}
+        self._grams: dict[str, set[int]] = {}   # substrings of length 1–3 -> ids
+        self._padded: dict[str, set[int]] = {}  # trigrams of "$$name$" -> ids, for fuzzy lookup
+        for pid, norm in self._norm.items():
+            for n in (1, 2, 3):
+                for i in range(len(norm) - n + 1):
+                    self._grams.setdefault(norm[i:i + n], set()).add(pid)
+            for gram in self._trigrams(norm):
+                self._padded.setdefault(gram, set()).add(pid)
+
+    @staticmethod
+    def _trigrams(norm: str) -> set[str]:
+        padded = f"$${norm}$"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _substring(self, q: str) -> set[int]:
+        if len(q) <= 3:
+            return set(self._grams.get(q, ()))
+        postings = [self._grams.get(q[i:i + 3], set()) for i in range(len(q) - 2)]
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {pid for pid in candidates if q in self._norm[pid]}
+
+    def _fuzzy(self, q: str, limit: int) -> list[tuple[int, int]]:
+        """(distance, id) for names within ``limit`` edits of ``q``, closest first."""
+        grams = self._trigrams(q)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for pid in self._padded.get(gram, ()):
+                shared[pid] = shared.get(pid, 0) + 1
+        # Count filter: one edit touches at most 3 trigrams, so a name within
+        # ``limit`` edits shares at least this many of the query's trigrams.
+        need = len(grams) - 3 * limit
+        found = []
+        for pid, n in shared.items():
+            if n < need:
+                continue
+            d = edit_distance(q, self._norm[pid], limit)
+            if d <= limit:
+                found.append((d, pid))
+        found.sort()
+        return found
+
+    def search(self, query: str, fuzzy: bool = True) -> list[int]:
+        """Ids whose name contains ``query``, prefix matches first; when
+        ``fuzzy`` also near-miss spellings after those."""
+        q = normalize(query)
+        if not q:
+            return list(self.names)
+        hits = self._substring(q)
+        ranked = sorted(hits, key=lambda pid: (not self._norm[pid].startswith(q), self._norm[pid]))
+        if fuzzy and max_typos(q):
+            ranked += [pid for _, pid in self._fuzzy(q, max_typos(q)) if pid not in hits]
+        return ranked
+
+    def best_match(self, answer: str) -> int | None:
+        """The id the typed ``answer`` most plausibly means, or None."""
+        q = normalize(answer)
+        if q in self._exact:
+            return self._exact[q]
+        found = self._fuzzy(q, max_typos(q)) if q else []
+        if not found or (len(found) > 1 and found[0][0] == found[1][0]):
+            return None  # nothing close, or ambiguous
+        return found[0][1]
+
+    def matches(self, answer: str, pokemon_id: int) -> bool:
+        """True if ``answer`` is (a near-miss spelling of) this Pokémon's name."""
+        return self.best_match(answer) == pokemon_id
+
+
+@lru_cache(maxsize=None)
+def get_name_index() -> NameIndex:
+    """The process-wide index over ``utils.pokemon_data.POKEMON``, built once."""
+    from utils.pokemon_data import POKEMON
+
+    return NameIndex(POKEMON)
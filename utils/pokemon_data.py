@@ -1,3 +1,7 @@
+from utils import sprites
+from utils.sprite_variants import variant_url
+from utils.species import species_table
+
 POKEMON = {
     1: "Bulbasaur", 2: "Ivysaur", 3: "Venusaur", 4: "Charmander", 5: "Charmeleon",
     6: "Charizard", 7: "Squirtle", 8: "Wartortle", 9: "Blastoise", 10: "Caterpie",
@@ -27,26 +31,37 @@ POKEMON = {
     148: "Dragonair", 149: "Dragonite", 150: "Mewtwo", 151: "Mew",
 }
 
-SPRITE_BASE = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{id}.png"
-SPRITE_BACK = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/back/{id}.png"
-
 POKEMON_IDS = list(POKEMON.keys())
 POKEMON_NAMES = list(POKEMON.values())
 
+_TABLE = None  # species_table(), resolved on the first get_stats call
+
 
 def get_stats(pokemon_id: int) -> dict:
-    """Derive simple battle stats from the Pokemon ID (deterministic)."""
-    seed = pokemon_id * 37
-    hp      = 40 + (seed % 61)          # 40–100
-    attack  = 30 + ((seed // 3) % 71)   # 30–100
-    defense = 20 + ((seed // 7) % 61)   # 20–80
-    speed   = 20 + ((seed // 11) % 61)  # 20–80
-    return {"hp": hp, "attack": attack, "defense": defense, "speed": speed}
+    """Battle stats of a Pokémon, from the shared species table (do not mutate)."""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = species_table()
+    return _TABLE.stats(pokemon_id)
+
+
+def sprite_url(pokemon_id: int, width: int | None = None) -> str:
+    if width:
+        return variant_url(pokemon_id, "front", width)
+    return sprites.resolve(sprites.pokemon_path(pokemon_id, sprites.FRONT))
+
+
+def back_sprite_url(pokemon_id: int, width: int | None = None) -> str:
+    if width:
+        return variant_url(pokemon_id, "back", width)
+    return sprites.resolve(sprites.pokemon_path(pokemon_id, sprites.BACK))
 
 
-def sprite_url(pokemon_id: int) -> str:
-    return SPRITE_BASE.format(id=pokemon_id)
+def shiny_sprite_url(pokemon_id: int, width: int | None = None) -> str:
+    if width:
+        return variant_url(pokemon_id, "shiny", width)
+    return sprites.resolve(sprites.pokemon_path(pokemon_id, sprites.SHINY))
 
 
-def back_sprite_url(pokemon_id: int) -> str:
-    return SPRITE_BACK.format(id=pokemon_id)
+def silhouette_url(pokemon_id: int, width: int) -> str:
+    return variant_url(pokemon_id, "silhouette", width)
@@ -0,0 +1,10 @@
+import streamlit as st
+
+from utils.caught_store import DEFAULT_PROFILE
+
+
+def player_profile() -> str:
+    """Sidebar field for the player name; returns the profile key for the caught store."""
+    name = st.sidebar.text_input("👤 Speler", value=st.session_state.get("profile", DEFAULT_PROFILE))
+    st.session_state.profile = name.strip() or DEFAULT_PROFILE
+    return st.session_state.profile
@@ -0,0 +1,83 @@
+"""
+The question deck of "Wie is dat Pokémon?".
+
+A round deals every species once, in an order drawn up front, so nothing
+repeats until the round is through and a draw is a ``list.pop``. The order is
+a weighted shuffle (each species gets the key ``random() ** (1 / weight)``,
+highest first): species the player often gets wrong tend to come early. The
+weight is the smoothed error rate ``(wrong + 1) / (seen + 2)``; it starts at
+½ and is updated by ``record`` after every answer.
+
+A missed species also comes back once more ``RETRY_GAP`` questions later. Every
+miss waits the same number of draws, so the retries form a FIFO queue. No
+species is asked twice in a row, whether it comes from the deck or the queue.
+
+Each question carries its distractors, drawn once when it is dealt, so the
+multiple-choice buttons stay put however often the page reruns.
+"""
+import random
+from collections import deque
+from typing import NamedTuple
+
+CHOICES = 4
+RETRY_GAP = 5
+
+
+class Question(NamedTuple):
+    pokemon_id: int
+    choices: tuple[int, ...]  # the answer and its distractors, shuffled
+
+
+class QuestionDeck:
+    def __init__(self, pokemon_ids: list[int], rng: random.Random = random, choices: int = CHOICES):
+        self.pokemon_ids = list(pokemon_ids)
+        self.rng = rng
+        self.n_choices = min(choices, len(self.pokemon_ids))
+        self.seen: dict[int, int] = {}
+        self.wrong: dict[int, int] = {}
+        self._deck: list[int] = []                    # this round, next question last
+        self._retry: deque[tuple[int, int]] = deque()  # (due at draw, pokemon_id)
+        self.draws = 0
+        self.last: int | None = None
+
+    def weight(self, pokemon_id: int) -> float:
+        return (self.wrong.get(pokemon_id, 0) + 1) / (self.seen.get(pokemon_id, 0) + 2)
+
+    def accuracy(self, pokemon_id: int) -> float | None:
+        seen = self.seen.get(pokemon_id, 0)
+        return (seen - self.wrong.get(pokemon_id, 0)) / seen if seen else None
+
+    def _deal_round(self) -> None:
+        rng, weight = self.rng, self.weight
+        self._deck = sorted(self.pokemon_ids, key=lambda pid: rng.random() ** (1 / weight(pid)))
+        if len(self._deck) > 1 and self._deck[-1] == self.last:  # no repeat across the round boundary
+            self._deck[0], self._deck[-1] = self._deck[-1], self._deck[0]
+
+    def _next_id(self) -> int:
+        if self._retry and self._retry[0][0] <= self.draws and self._retry[0][1] != self.last:
+            return self._retry.popleft()[1]
+        if self._deck and self._deck[-1] == self.last:  # just served as a retry
+            if len(self._deck) > 1:
+                self._deck[-1], self._deck[-2] = self._deck[-2], self._deck[-1]
+            else:
+                self._deck.pop()  # asked this round already
+        if not self._deck:
+            self._deal_round()
+        return self._deck.pop()
+
+    def draw(self) -> Question:
+        """The next question, with its distractors."""
+        pid = self._next_id()
+        self.draws += 1
+        self.last = pid
+        others = [p for p in self.rng.sample(self.pokemon_ids, self.n_choices) if p != pid][:self.n_choices - 1]
+        choices = [pid, *others]
+        self.rng.shuffle(choices)
+        return Question(pid, tuple(choices))
+
+    def record(self, pokemon_id: int, correct: bool) -> None:
+        """Count an answer; a miss brings the species back after ``RETRY_GAP`` questions."""
+        self.seen[pokemon_id] = self.seen.get(pokemon_id, 0) + 1
+        if not correct:
+            self.wrong[pokemon_id] = self.wrong.get(pokemon_id, 0) + 1
+            self._retry.append((self.draws + RETRY_GAP, pokemon_id))
@@ -0,0 +1,53 @@
+"""
+Species table: ids, names and battle stats of every Pokémon, precomputed once
+per process into compact parallel arrays and shared by all pages and sessions.
+
+Row ``i`` describes ``ids[i]``; ``row_of`` maps a Pokémon id to its row. The
+stat columns are ``array('B')`` (all stats fit in a byte), so they can be
+wrapped zero-copy with ``numpy.frombuffer`` for vectorised work.
+"""
+from array import array
+
+import streamlit as st
+
+STAT_NAMES = ("hp", "attack", "defense", "speed")
+
+
+def derive_stats(pokemon_id: int) -> dict:
+    """Derive simple battle stats from the Pokemon ID (deterministic)."""
+    seed = pokemon_id * 37
+    hp      = 40 + (seed % 61)          # 40–100
+    attack  = 30 + ((seed // 3) % 71)   # 30–100
+    defense = 20 + ((seed // 7) % 61)   # 20–80
+    speed   = 20 + ((seed // 11) % 61)  # 20–80
+    return {"hp": hp, "attack": attack, "defense": defense, "speed": speed}
+
+
+class SpeciesTable:
+    def __init__(self, pokemon: dict[int, str]):
+        self.ids = array("H", pokemon)
+        self.names = tuple(pokemon.values())
+        self.row_of = {pid: row for row, pid in enumerate(self.ids)}
+        stats = [derive_stats(pid) for pid in self.ids]
+        self.hp = array("B", (s["hp"] for s in stats))
+        self.attack = array("B", (s["attack"] for s in stats))
+        self.defense = array("B", (s["defense"] for s in stats))
+        self.speed = array("B", (s["speed"] for s in stats))
+        # One shared dict per species, handed out by ``stats`` without copying
+        self._stats = stats
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def stats(self, pokemon_id: int) -> dict:
+        """Battle stats of ``pokemon_id``. The dict is shared — do not mutate it."""
+        row = self.row_of.get(pokemon_id)
+        return self._stats[row] if row is not None else derive_stats(pokemon_id)
+
+
+@st.cache_resource(show_spinner=False)
+def species_table() -> SpeciesTable:
+    """The process-wide table over ``utils.pokemon_data.POKEMON``."""
+    from utils.pokemon_data import POKEMON
+
+    return SpeciesTable(POKEMON)
@@ -0,0 +1,102 @@
+"""
+Fake sprite server for running the app (and its tests) without network access.
+
+Answers every ``GET /<anything>.png`` with a small generated 96×96 PNG: a
+coloured disc on a transparent background, the colour derived from the path,
+so different Pokémon look different and silhouettes still work.
+
+    python -m utils.sprite_server --port 8765
+    POKEDEX_SPRITE_SOURCE=http://127.0.0.1:8765 streamlit run 10_🎮_Pokemon.py
+
+Harnesses call ``isolate_sprites(tmp)``: it starts the server and switches this
+process to a copy of the sprite store, so runs need no network and never leave
+placeholder sprites in ``static/``.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import struct
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SIZE = 96
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def fake_sprite(path: str, size: int = SIZE) -> bytes:
+    """A deterministic RGBA PNG for ``path``."""
+    r, g, b = hashlib.md5(path.encode()).digest()[:3]
+    centre, radius2 = (size - 1) / 2, (size * 0.38) ** 2
+    rows = []
+    for y in range(size):
+        row = bytearray(b"\x00")  # filter type: none
+        for x in range(size):
+            inside = (x - centre) ** 2 + (y - centre) ** 2 <= radius2
+            row += bytes((r, g, b, 255)) if inside else b"\x00\x00\x00\x00"
+        rows.append(bytes(row))
+    header = struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(b"".join(rows), 9))
+        + _chunk(b"IEND", b"")
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].lstrip("/")
+        if not path.endswith(".png"):
+            self.send_error(404)
+            return
+        body = fake_sprite(path)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_in_thread(port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Start the server on a daemon thread; returns the server and its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def use_sprites(sprite_dir: str, source: str) -> None:
+    """Keep sprites in ``sprite_dir`` and download missing ones from ``source``."""
+    from utils import atlas, sprites
+
+    sprites.SPRITE_DIR = sprite_dir
+    sprites.SPRITE_SOURCE = source
+    atlas.INDEX_FILE = os.path.join(sprite_dir, "atlas.json")
+
+
+def isolate_sprites(tmp: str) -> tuple[str, str]:
+    """Serve fake sprites and use a copy of the sprite store under ``tmp``;
+    returns (sprite dir, source URL) for ``use_sprites`` in worker processes."""
+    from utils import sprites
+
+    sprite_dir = os.path.join(tmp, "sprites")
+    if os.path.isdir(sprites.SPRITE_DIR):
+        shutil.copytree(sprites.SPRITE_DIR, sprite_dir)
+    _, source = serve_in_thread()
+    use_sprites(sprite_dir, source)
+    return sprite_dir, source
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    print(f"Serving fake sprites on http://127.0.0.1:{args.port}")
+    ThreadingHTTPServer(("127.0.0.1", args.port), _Handler).serve_forever()
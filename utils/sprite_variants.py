@@ -0,0 +1,96 @@
+"""
+Precomputed sprite derivatives.
+
+Each (pokemon_id, variant, width) is rendered once with Pillow and kept in
+``static/sprites/derived/<variant>/<width>/<id>.png``:
+  • front / back / shiny   the PokeAPI sprite, upscaled nearest-neighbour
+  • silhouette             the front sprite with every visible pixel black
+
+A silhouette's URL still carries the Pokédex id, so the quiz shows it from its
+bytes (``silhouette_bytes``, served by Streamlit under an opaque name), and no
+silhouette ever falls back to the colour sprite.
+
+Pages ask for the width they display at, so the browser never rescales.
+"""
+import io
+import os
+import threading
+
+from utils import sprites
+
+VARIANTS = {
+    "front": sprites.FRONT,
+    "back": sprites.BACK,
+    "shiny": sprites.SHINY,
+    "silhouette": sprites.FRONT,
+}
+
+_lock = threading.Lock()
+
+
+def variant_path(pokemon_id: int, variant: str, width: int, fmt: str = "png") -> str:
+    return f"derived/{variant}/{width}/{pokemon_id}.{fmt}"
+
+
+def _render(src: str, variant: str, width: int, fmt: str) -> bytes:
+    from PIL import Image
+
+    with Image.open(src) as img:
+        img = img.convert("RGBA")
+    if variant == "silhouette":
+        alpha = img.getchannel("A").point(lambda a: 255 if a else 0)
+        img = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        img.putalpha(alpha)
+    if img.width != width:
+        img = img.resize((width, round(img.height * width / img.width)), Image.NEAREST)
+    buf = io.BytesIO()
+    if fmt == "webp":
+        img.save(buf, "WEBP", lossless=True)
+    else:
+        img.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def derive(pokemon_id: int, variant: str, width: int, fmt: str = "png") -> str | None:
+    """Make sure the derivative is on disk; returns its sprite path, or None
+    while the source sprite is not in the local store yet."""
+    rel = variant_path(pokemon_id, variant, width, fmt)
+    dest = sprites.local_path(rel)
+    if os.path.exists(dest):
+        return rel
+    src = sprites.local_path(sprites.pokemon_path(pokemon_id, VARIANTS[variant]))
+    if not os.path.exists(src):
+        return None
+    data = _render(src, variant, width, fmt)
+    with _lock:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, dest)
+    return rel
+
+
+def variant_url(pokemon_id: int, variant: str = "front", width: int = 96) -> str:
+    """URL of the derivative; until the source sprite is available this is the
+    original sprite (callers keep their CSS sizing as a fallback), or a Poké
+    Ball for a silhouette."""
+    rel = derive(pokemon_id, variant, width)
+    if rel is None:
+        source = sprites.resolve(sprites.pokemon_path(pokemon_id, VARIANTS[variant]))  # queues the download
+        return sprites.resolve(sprites.POKE_BALL) if variant == "silhouette" else source
+    return sprites.resolve(rel)
+
+
+def variant_bytes(pokemon_id: int, variant: str = "front", width: int = 96, fmt: str = "png") -> bytes | None:
+    """The derivative's encoded bytes (e.g. for ``st.image``), or None if unavailable."""
+    rel = derive(pokemon_id, variant, width, fmt)
+    return sprites.sprite_bytes(rel) if rel else None
+
+
+def silhouette_bytes(pokemon_id: int, width: int, timeout: float = 3.0) -> bytes | None:
+    """The silhouette's PNG bytes, downloading the front sprite first if needed;
+    None if that download fails."""
+    if not sprites.fetch_now(sprites.pokemon_path(pokemon_id, VARIANTS["silhouette"]), timeout):
+        return None
+    return variant_bytes(pokemon_id, "silhouette", width)
@@ -0,0 +1,220 @@
+"""
+Local sprite store.
+
+Sprites are downloaded from ``SPRITE_SOURCE`` (PokeAPI on GitHub by default,
+override with ``$POKEDEX_SPRITE_SOURCE``) at most once, into ``static/sprites/``
+next to the app, and from then on served by Streamlit's static file server
+(``server.enableStaticServing`` in ``.streamlit/config.toml``). When static
+serving is off, cached sprites are inlined as data URIs instead. A failed
+download is retried on a later request, ``RETRY_AFTER`` seconds on.
+
+Paths are relative to the PokeAPI ``sprites/`` folder, e.g. ``pokemon/25.png``.
+
+Command line:
+    python -m utils.sprites fetch                # download every sprite the app uses
+    python -m utils.sprites import <dir|tarball> # import from a local PokeAPI checkout
+"""
+import base64
+import os
+import shutil
+import sys
+import tarfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+SPRITE_SOURCE = os.environ.get(
+    "POKEDEX_SPRITE_SOURCE",
+    "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites",
+).rstrip("/")
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "..", "static")
+SPRITE_DIR = os.path.join(STATIC_DIR, "sprites")
+STATIC_URL = "/app/static/sprites"
+
+FRONT = "pokemon/{id}.png"
+BACK = "pokemon/back/{id}.png"
+SHINY = "pokemon/shiny/{id}.png"
+POKE_BALL = "items/poke-ball.png"
+RETRY_AFTER = 60.0  # seconds before a failed download is tried again
+
+_downloader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sprite-fetch")
+_in_flight: set[str] = set()
+_failed: dict[str, float] = {}  # path -> time.monotonic() of its last failed download
+_data_uris: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def pokemon_path(pokemon_id: int, variant: str = FRONT) -> str:
+    return variant.format(id=pokemon_id)
+
+
+def local_path(rel: str) -> str:
+    return os.path.join(SPRITE_DIR, *rel.split("/"))
+
+
+def remote_url(rel: str) -> str:
+    return f"{SPRITE_SOURCE}/{rel}"
+
+
+def fetch(rel: str, timeout: float = 10.0) -> bool:
+    """Download one sprite into the store unless it is already there."""
+    dest = local_path(rel)
+    if os.path.exists(dest):
+        return True
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f"{dest}.{threading.get_ident()}.part"
+    try:
+        with urllib.request.urlopen(remote_url(rel), timeout=timeout) as resp, open(tmp, "wb") as f:
+            shutil.copyfileobj(resp, f)
+        os.replace(tmp, dest)
+        return True
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+
+def _backing_off(rel: str) -> bool:
+    failed_at = _failed.get(rel)
+    return failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER
+
+
+def _fetch_in_background(rel: str) -> None:
+    def run():
+        ok = fetch(rel)
+        with _lock:
+            _in_flight.discard(rel)
+            if ok:
+                _failed.pop(rel, None)
+            else:
+                _failed[rel] = time.monotonic()
+
+    with _lock:
+        if rel in _in_flight or _backing_off(rel):
+            return
+        _in_flight.add(rel)
+    _downloader.submit(run)
+
+
+def fetch_now(rel: str, timeout: float = 3.0) -> bool:
+    """Make sure the sprite is in the store, downloading it in this thread if
+    needed (not while a recent failure is backing off)."""
+    if os.path.exists(local_path(rel)):
+        return True
+    with _lock:
+        if _backing_off(rel):
+            return False
+    ok = fetch(rel, timeout)
+    with _lock:
+        if ok:
+            _failed.pop(rel, None)
+        else:
+            _failed[rel] = time.monotonic()
+    return ok
+
+
+def sprite_bytes(rel: str) -> bytes | None:
+    """The cached sprite's PNG bytes, or None if it is not in the store."""
+    try:
+        with open(local_path(rel), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _static_serving() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except RuntimeError:
+        return False
+
+
+def resolve(rel: str) -> str:
+    """URL for a sprite, usable both in ``st.image`` and in ``<img src>``.
+
+    Cached sprites come from the static folder (or a data URI); a missing
+    sprite is queued for download and hot-linked from the source this once.
+    """
+    if os.path.exists(local_path(rel)):
+        if _static_serving():
+            return f"{STATIC_URL}/{rel}"
+        uri = _data_uris.get(rel)
+        if uri is None:
+            data = sprite_bytes(rel)
+            uri = _data_uris[rel] = "data:image/png;base64," + base64.b64encode(data).decode()
+        return uri
+    _fetch_in_background(rel)
+    return remote_url(rel)
+
+
+def wanted_paths(pokemon_ids) -> list[str]:
+    """Every sprite path the app uses for these Pokémon."""
+    paths = [POKE_BALL]
+    for pid in pokemon_ids:
+        paths += [pokemon_path(pid, variant) for variant in (FRONT, BACK, SHINY)]
+    return paths
+
+
+def prefetch(paths: list[str], workers: int = 8) -> int:
+    """Download all ``paths`` that are not cached yet; returns how many are now present."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(fetch, paths))
+
+
+def import_from(source: str, paths: list[str]) -> int:
+    """Copy sprites from a local PokeAPI ``sprites`` checkout or tarball.
+
+    Anything up to and including a ``sprites/`` folder in a member's path is
+    ignored, so both the repository root and its ``sprites`` folder work.
+    """
+    wanted = set(paths)
+
+    def rel_of(name: str) -> str:
+        name = name.replace(os.sep, "/")
+        return name.rsplit("sprites/", 1)[-1]
+
+    def store(rel: str, data: bytes) -> None:
+        dest = local_path(rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "wb") as f:
+            f.write(data)
+
+    imported = 0
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in files:
+                full = os.path.join(root, name)
+                rel = rel_of(os.path.relpath(full, source))
+                if rel in wanted:
+                    with open(full, "rb") as f:
+                        store(rel, f.read())
+                    imported += 1
+    else:
+        with tarfile.open(source) as tar:
+            for member in tar:
+                rel = rel_of(member.name)
+                if member.isfile() and rel in wanted:
+                    store(rel, tar.extractfile(member).read())
+                    imported += 1
+    return imported
+
+
+def main(argv: list[str]) -> int:
+    from utils.pokemon_data import POKEMON_IDS
+
+    paths = wanted_paths(POKEMON_IDS)
+    if argv[:1] == ["fetch"]:
+        print(f"{prefetch(paths)}/{len(paths)} sprites in {SPRITE_DIR}")
+    elif argv[:1] == ["import"] and len(argv) == 2:
+        print(f"{import_from(argv[1], paths)} sprites imported into {SPRITE_DIR}")
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))